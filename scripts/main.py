@@ -7,23 +7,52 @@ import sys
 import time
 import copy
 import random
-import datetime
-import fnmatch
+import functools
+import threading
 from pathlib import Path
 from typing import Dict, List, Set, Optional, Any
 from itertools import islice, zip_longest
+from concurrent.futures import ThreadPoolExecutor
 
 # 모듈 자동 설치
 try:
     import subprocess
     import importlib.util
+    import hashlib
     
-    required_modules = ["rich", "watchdog", "ruamel.yaml", "tinydb", "pandas", "openpyxl", "safetensors"]
+    # {모듈명: pip 패키지명}
+    required_modules = {
+        "rich": "rich",
+        "watchdog": "watchdog",
+        "yaml": "PyYAML",
+        "ruamel.yaml": "ruamel.yaml",
+        "orjson": "orjson",
+        "pandas": "pandas",
+        "openpyxl": "openpyxl",
+        "safetensors": "safetensors",
+        "urllib3": "urllib3",
+        "websocket": "websocket-client",
+    }
     
-    for module in required_modules:
-        if importlib.util.find_spec(module) is None:
-            print(f"📦 '{module}' 모듈이 설치되어 있지 않아 설치를 시도합니다...")
-            subprocess.check_call([sys.executable, "-m", "pip", "install", module])
+    # 같은 인터프리터에서 모듈 목록이 그대로이고 이전에 확인을 마쳤다면 검사를 건너뜀
+    # (인터프리터마다 설치된 패키지가 다르므로 경로와 버전도 포함, COMFYUI_FORCE_CHECK 환경변수로 강제 검사)
+    modules_hash = hashlib.md5(
+        '\n'.join([
+            sys.executable,
+            sys.version,
+            ','.join(f'{m}={p}' for m, p in required_modules.items()),
+        ]).encode()
+    ).hexdigest()
+    install_stamp = Path.home() / '.cache' / 'comfyu-autoscript' / f'installed.{modules_hash}'
+    
+    if not install_stamp.exists() or os.environ.get('COMFYUI_FORCE_CHECK'):
+        for module, package in required_modules.items():
+            if importlib.util.find_spec(module) is None:
+                print(f"📦 '{module}' 모듈이 설치되어 있지 않아 설치를 시도합니다...")
+                subprocess.check_call([sys.executable, "-m", "pip", "install", package])
+        
+        install_stamp.parent.mkdir(parents=True, exist_ok=True)
+        install_stamp.touch()
 except Exception:
     pass
 
@@ -34,14 +63,22 @@ sys.path.insert(0, parent_dir)
 
 from utils.config_loader import ConfigLoader
 from utils.yaml_handler import YAMLHandler
-from utils.file_handler import FileEventHandler, FileObserver, get_file_dict_list
-from utils.dict_utils import get_nested, set_nested, set_exists, update_dict, update_dict_key, convert_paths
+from utils.file_handler import FileEventHandler, FileObserver, get_file_dict_list, get_file_dict_list_multi, SAFETENSORS_SUFFIX, FFS_IGNORE_PATTERNS
+from utils.dict_utils import get_nested, set_nested, set_exists, update_dict
 from utils.random_utils import random_weight_count, random_min_max, random_weight, random_dict_weight, seed_int, random_items_count
 from utils.type_utils import get_type_list
 from utils.print_log import print, logger
 from utils.comfy_api import queue_prompt, queue_prompt_wait
 from utils.db_handler import DatabaseHandler
 from watchdog.events import FileSystemEvent
+import orjson
+import yaml
+
+# libyaml C 확장이 있으면 사용
+try:
+    from yaml import CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeDumper
 
 # 설정 파일이 없으면 생성
 config_path = Path(parent_dir) / 'config.yml'
@@ -53,17 +90,44 @@ if not config_path.exists():
 class ComfyUIAutomation:
     """ComfyUI 자동화 메인 클래스"""
     
+    # {파일명 목록 키: (가중치 키, 가중치에 없는 파일명 목록 키)}
+    _SUB_NAMES_KEYS = {
+        'CheckpointFileNames': ('WeightCheckpoint', 'SubCheckpointNames'),
+        'CharFileNames': ('WeightChar', 'SubCharNames'),
+    }
+    
+    # SetWildcardSort 기본값
+    SET_WILDCARD_SORT = ('setup', 'Checkpoint', 'Char', 'Weight', 'Lora')
+    
+    # SafeTensors 파일 이벤트를 모아서 처리할 대기 시간 (초)
+    SAFETENSORS_DEBOUNCE = 0.2
+    
     def __init__(self):
-        self.time_start = time.time()
+        self.time_start = time.monotonic()
         
         # 설정
         self.config_loader = ConfigLoader()
         self.config = self.config_loader.config
         self.checkpoint_types = list(self.config.get('CheckpointTypes', {}).keys())
+        # 콜백에서 멤버 검사용
+        self.checkpoint_types_set = frozenset(self.checkpoint_types)
         self.is_first = True
+        self._bind_hot_config()
         
         # 타입별 데이터
         self.type_dics: Dict[str, Dict] = {}
+        # 현재 체크포인트 타입의 데이터 (self.type_dics[self.checkpoint_type])
+        self._cur_type_dic: Dict = {}
+        # YAML 및 가중치까지 모두 읽은 체크포인트 타입
+        self._loaded_types: Set[str] = set()
+        self._init_delete = True
+        self._timestamp_sec = -1
+        self._timestamp_str = ''
+        
+        # 경로별 마지막 SafeTensors 이벤트 {경로: (업데이트 함수, 체크포인트 타입, 이벤트 종류)}
+        self._pending_safetensors: Dict[Path, tuple] = {}
+        self._pending_lock = threading.Lock()
+        self._pending_timer: Optional[threading.Timer] = None
         
         # 현재 선택된 항목
         self.checkpoint_type: Optional[str] = None
@@ -101,50 +165,111 @@ class ComfyUIAutomation:
         self.workflow_api: Dict = {}
         
         # YAML 핸들러
-        self.yaml_handler = YAMLHandler()
+        self.yaml_handler = YAMLHandler(preserve_comments=False)
     
     def get_config(self, key: str, default: Any = None) -> Any:
         """설정 값을 가져옵니다."""
         return self.config.get(key, default)
     
+    def _bind_hot_config(self):
+        """큐마다 사용하는 설정 값을 미리 가공해 둡니다."""
+        self._exclude_nodes = frozenset(self.get_config('excludeNode') or ())
+        self._checkpoint_weight_per = self.get_config('CheckpointWeightPer', 0.5)
+        self._no_char_per = self.get_config('noCharPer', 0.5)
+        self._char_weight_per = self.get_config('CharWeightPer', 0.5)
+        self._no_lora_per = self.get_config('noLoraPer', 0.5)
+        self._set_workflow_print = self.get_config('SetWorkflowPrint', False)
+        self._lora_change_print = self.get_config('LoraChangePrint', False)
+        
+        # 파일 이벤트마다 Path를 새로 만들지 않도록 미리 만들어 둠
+        self._data_path = self._config_path('dataPath')
+        self._checkpoint_path = self._config_path('CheckpointPath')
+        self._lora_path = self._config_path('LoraPath')
+    
+    def _config_path(self, key: str) -> Optional[Path]:
+        """설정의 경로 값을 Path로 반환합니다. (없으면 None)"""
+        value = self.get_config(key)
+        return Path(value) if value else None
+    
+    def _reload_config(self):
+        """설정 파일을 다시 읽습니다."""
+        version = self.config_loader.version
+        self.config_loader.reload()
+        if self.config_loader.version == version:
+            return
+        self.config = self.config_loader.config
+        self._bind_hot_config()
+    
     def get_now(self, *keys, default: Any = None) -> Any:
         """현재 체크포인트 타입의 데이터를 가져옵니다."""
-        return get_nested(self.type_dics, self.checkpoint_type, *keys, default=default)
+        return get_nested(self._cur_type_dic, *keys, default=default)
     
     def set_now(self, value: Any, *keys):
         """현재 체크포인트 타입의 데이터를 설정합니다."""
-        return set_nested(self.type_dics, value, self.checkpoint_type, *keys)
+        return set_nested(self._cur_type_dic, value, *keys)
     
     def init(self, delete: bool = True, db: bool = False):
-        """초기화합니다."""
+        """
+        초기화합니다.
+        
+        랜덤 선택에 필요한 SafeTensors 파일 목록과 setup 파일만 읽고,
+        타입별 YAML 및 가중치는 해당 타입이 처음 선택될 때 읽습니다 (_ensure_type_loaded).
+        """
         if db:
             self.db.init(self.get_config('dataPath'))
         
-        data_path = Path(self.get_config('dataPath'))
+        self._init_delete = delete
+        self._loaded_types = set()
         
+        # 타입별 딕셔너리는 메인 스레드에서 미리 만들어 두고
+        # 각 작업은 자기 타입의 딕셔너리에만 쓰도록 함
         for checkpoint_type in self.checkpoint_types:
             self.type_dics[checkpoint_type] = {}
-            
-            # SafeTensors 파일 목록 가져오기
-            self._get_safetensors_checkpoint(checkpoint_type)
-            self._get_safetensors_char(checkpoint_type)
-            self._get_safetensors_etc(checkpoint_type)
-            
-            # 설정 파일 가져오기
-            self._get_setup_wildcard(checkpoint_type)
-            self._get_setup_workflow(checkpoint_type)
-            
-            # 가중치 가져오기
-            self._get_weight_checkpoint(checkpoint_type)
-            self._get_weight_lora(checkpoint_type, delete)
-            self._get_weight_char(checkpoint_type)
-            
-            # YAML 딕셔너리 가져오기
-            self._get_dic_checkpoint_yml(checkpoint_type)
-            self._get_dic_lora_yml(checkpoint_type)
-            
-            # 워크플로우 API 가져오기
-            self._get_workflow_api(checkpoint_type)
+        
+        # 타입별 디렉토리 순회는 서로 독립적인 I/O이므로 병렬로 처리
+        if self.checkpoint_types:
+            max_workers = min(len(self.checkpoint_types), os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(self._init_shallow, checkpoint_type)
+                    for checkpoint_type in self.checkpoint_types
+                ]
+                for future in futures:
+                    future.result()
+        
+        # 설정 파일 가져오기 (공통 파일을 한 번만 읽도록 전체 타입을 한꺼번에 처리)
+        self._get_setup_wildcard()
+        self._get_setup_workflow()
+    
+    def _init_shallow(self, checkpoint_type: str):
+        """체크포인트 타입 하나의 SafeTensors 파일 목록을 가져옵니다."""
+        self._get_safetensors_checkpoint(checkpoint_type)
+        self._get_safetensors_lora(checkpoint_type)
+    
+    def _ensure_type_loaded(self, checkpoint_type: str):
+        """체크포인트 타입의 YAML 및 가중치를 처음 선택될 때 한 번만 가져옵니다."""
+        if checkpoint_type in self._loaded_types:
+            return
+        
+        # 가중치 가져오기
+        self._get_weight_checkpoint(checkpoint_type)
+        self._get_weight_lora(checkpoint_type, self._init_delete)
+        self._get_weight_char(checkpoint_type)
+        
+        # YAML 딕셔너리 가져오기
+        self._get_dic_checkpoint_yml(checkpoint_type)
+        self._get_dic_lora_yml(checkpoint_type)
+        
+        # 워크플로우 API 가져오기
+        self._get_workflow_api(checkpoint_type)
+        
+        self._loaded_types.add(checkpoint_type)
+    
+    def _set_checkpoint_type(self, checkpoint_type: str):
+        """현재 체크포인트 타입을 바꾸고 해당 타입의 데이터를 준비합니다."""
+        self.checkpoint_type = checkpoint_type
+        self._cur_type_dic = self.type_dics.setdefault(checkpoint_type, {})
+        self._ensure_type_loaded(checkpoint_type)
     
     def _get_safetensors_checkpoint(self, checkpoint_type: str):
         """Checkpoint SafeTensors 파일 목록을 가져옵니다."""
@@ -165,33 +290,24 @@ class ComfyUIAutomation:
         
         print.Value('CheckpointFiles', checkpoint_type, len(file_names))
     
-    def _get_safetensors_char(self, checkpoint_type: str):
-        """Char SafeTensors 파일 목록을 가져옵니다."""
+    def _get_safetensors_lora(self, checkpoint_type: str):
+        """Char / Etc SafeTensors 파일 목록을 한 번의 순회로 가져옵니다."""
         lora_path = Path(self.get_config('LoraPath'))
-        char_path = lora_path / checkpoint_type / self.get_config('LoraCharPath', 'char')
+        type_path = lora_path / checkpoint_type
+        roots = {
+            'Char': type_path / self.get_config('LoraCharPath', 'char'),
+            'Lora': type_path / self.get_config('LoraEtcPath', 'etc'),
+        }
         
-        file_dict, file_list, file_names = get_file_dict_list(char_path, lora_path)
+        results = get_file_dict_list_multi(type_path, roots, lora_path)
         
-        # init에서 호출될 때는 checkpoint_type을 직접 사용
-        set_nested(self.type_dics, file_dict, checkpoint_type, 'CharFileDics')
-        set_nested(self.type_dics, file_list, checkpoint_type, 'CharFileLists')
-        set_nested(self.type_dics, file_names, checkpoint_type, 'CharFileNames')
-        
-        print.Value('CharFiles', checkpoint_type, len(file_names))
-    
-    def _get_safetensors_etc(self, checkpoint_type: str):
-        """Etc SafeTensors 파일 목록을 가져옵니다."""
-        lora_path = Path(self.get_config('LoraPath'))
-        etc_path = lora_path / checkpoint_type / self.get_config('LoraEtcPath', 'etc')
-        
-        file_dict, file_list, file_names = get_file_dict_list(etc_path, lora_path)
-        
-        # init에서 호출될 때는 checkpoint_type을 직접 사용
-        set_nested(self.type_dics, file_dict, checkpoint_type, 'LoraFileDics')
-        set_nested(self.type_dics, file_list, checkpoint_type, 'LoraFileLists')
-        set_nested(self.type_dics, file_names, checkpoint_type, 'LoraFileNames')
-        
-        print.Value('LoraFiles', checkpoint_type, len(file_names))
+        for key, (file_dict, file_list, file_names) in results.items():
+            # init에서 호출될 때는 checkpoint_type을 직접 사용
+            set_nested(self.type_dics, file_dict, checkpoint_type, f'{key}FileDics')
+            set_nested(self.type_dics, file_list, checkpoint_type, f'{key}FileLists')
+            set_nested(self.type_dics, file_names, checkpoint_type, f'{key}FileNames')
+            
+            print.Value(f'{key}Files', checkpoint_type, len(file_names))
     
     def _get_setup_wildcard(self, checkpoint_type: str = None):
         """setupWildcard.yml을 가져옵니다."""
@@ -202,8 +318,11 @@ class ComfyUIAutomation:
         else:
             checkpoint_types = self.checkpoint_types
         
+        # 공통 setupWildcard.yml은 한 번만 읽고 타입별로 복사해서 사용
+        global_wildcard = self.yaml_handler.load_simple(str(data_path / 'setupWildcard.yml')) or {}
+        
         for ct in checkpoint_types:
-            setup_wildcard = self.yaml_handler.load_simple(str(data_path / 'setupWildcard.yml')) or {}
+            setup_wildcard = copy.deepcopy(global_wildcard)
             type_wildcard = self.yaml_handler.load_simple(str(data_path / ct / 'setupWildcard.yml')) or {}
             
             update_dict(setup_wildcard, type_wildcard)
@@ -223,8 +342,11 @@ class ComfyUIAutomation:
         else:
             checkpoint_types = self.checkpoint_types
         
+        # 공통 setupWorkflow.yml은 한 번만 읽고 타입별로 복사해서 사용
+        global_workflow = self.yaml_handler.load_simple(str(data_path / 'setupWorkflow.yml')) or {}
+        
         for ct in checkpoint_types:
-            setup_workflow = self.yaml_handler.load_simple(str(data_path / 'setupWorkflow.yml')) or {}
+            setup_workflow = copy.deepcopy(global_workflow)
             type_workflow = self.yaml_handler.load_simple(str(data_path / ct / 'setupWorkflow.yml')) or {}
             
             update_dict(setup_workflow, type_workflow)
@@ -257,6 +379,7 @@ class ComfyUIAutomation:
         print.Value('WeightCheckpoint', checkpoint_type, len(weight_checkpoint))
         # init에서 호출될 때는 checkpoint_type을 직접 사용
         set_nested(self.type_dics, weight_checkpoint, checkpoint_type, 'WeightCheckpoint')
+        self._update_sub_names(checkpoint_type, 'CheckpointFileNames')
     
     def _get_weight_char(self, checkpoint_type: str):
         """WeightChar.yml을 가져옵니다."""
@@ -280,6 +403,16 @@ class ComfyUIAutomation:
         print.Value('WeightChar', checkpoint_type, len(weight_char))
         # init에서 호출될 때는 checkpoint_type을 직접 사용
         set_nested(self.type_dics, weight_char, checkpoint_type, 'WeightChar')
+        self._update_sub_names(checkpoint_type, 'CharFileNames')
+    
+    def _update_sub_names(self, checkpoint_type: str, names_key: str):
+        """가중치에 없는 파일명 목록(SubCheckpointNames / SubCharNames)을 다시 계산합니다."""
+        weight_key, sub_key = self._SUB_NAMES_KEYS[names_key]
+        file_names = get_nested(self.type_dics, checkpoint_type, names_key, default=[])
+        weight = get_nested(self.type_dics, checkpoint_type, weight_key, default={})
+        
+        sub_names = tuple(x for x in file_names if x not in weight)
+        set_nested(self.type_dics, sub_names, checkpoint_type, sub_key)
     
     def _get_weight_lora(self, checkpoint_type: str, delete: bool = True):
         """WeightLora.yml을 가져옵니다."""
@@ -308,6 +441,8 @@ class ComfyUIAutomation:
         if not weight_lora:
             return
         
+        lora_names_set = frozenset(lora_file_names)
+        
         for k1, v1 in list(weight_lora.items()):
             if not isinstance(v1, dict):
                 continue
@@ -326,11 +461,11 @@ class ComfyUIAutomation:
                 loras_tmp = None
                 
                 if isinstance(loras, dict):
-                    loras_tmp = {k3: v3 for k3, v3 in loras.items() if k3 in lora_file_names}
+                    loras_tmp = {k3: v3 for k3, v3 in loras.items() if k3 in lora_names_set}
                 elif isinstance(loras, list):
-                    loras_tmp = [k3 for k3 in loras if k3 in lora_file_names]
+                    loras_tmp = [k3 for k3 in loras if k3 in lora_names_set]
                 elif isinstance(loras, str):
-                    loras_tmp = loras if loras in lora_file_names else None
+                    loras_tmp = loras if loras in lora_names_set else None
                 
                 if not loras_tmp:
                     dic.pop(k2)
@@ -382,6 +517,33 @@ class ComfyUIAutomation:
         if workflow_api:
             # init에서 호출될 때는 checkpoint_type을 직접 사용
             set_nested(self.type_dics, workflow_api, checkpoint_type, 'workflow_api')
+            set_nested(self.type_dics, self._precompute_workflow_key_types(workflow_api),
+                       checkpoint_type, 'workflow_key_types')
+            
+            # 큐마다 deepcopy 하는 대신 직렬화해 둔 원본을 orjson.loads로 복원해서 사용
+            try:
+                workflow_api_blob = orjson.dumps(workflow_api)
+            except TypeError:
+                workflow_api_blob = None
+            set_nested(self.type_dics, workflow_api_blob, checkpoint_type, 'workflow_api_blob')
+    
+    def _precompute_workflow_key_types(self, workflow_api: Dict) -> Dict[str, tuple]:
+        """
+        노드별 inputs의 키를 값의 타입에 따라 미리 나눠 둡니다.
+        
+        inputs의 구조는 큐마다 바뀌지 않으므로 워크플로우를 읽을 때 한 번만 계산합니다.
+        
+        Returns:
+            {노드: (숫자 키 튜플, 문자열/불리언 키 튜플)} 딕셔너리
+        """
+        key_types = {}
+        for node, v in workflow_api.items():
+            inputs = v.get('inputs', {}) if isinstance(v, dict) else {}
+            key_types[node] = (
+                tuple(get_type_list(inputs, (int, float), (bool,))),
+                tuple(get_type_list(inputs, (str, bool))),
+            )
+        return key_types
     
     def checkpoint_change(self):
         """Checkpoint를 선택합니다."""
@@ -397,7 +559,7 @@ class ComfyUIAutomation:
                    safetensors_path.parts[0] in checkpoint_types and \
                    ck:
                     print.Value('safetensorsStart', safetensors_path.parts)
-                    self.checkpoint_type = safetensors_path.parts[0]
+                    self._set_checkpoint_type(safetensors_path.parts[0])
                     print.Value('checkpoint_type', self.checkpoint_type)
                     self.checkpoint_name = safetensors_path.stem
                     print.Value('checkpoint_name', self.checkpoint_name)
@@ -406,10 +568,10 @@ class ComfyUIAutomation:
                     return
         
         # 랜덤으로 Checkpoint 타입 선택
-        self.checkpoint_type = random_weight_count(checkpoint_types)[0]
+        self._set_checkpoint_type(random_weight_count(checkpoint_types)[0])
         print.Value('checkpoint_type', self.checkpoint_type)
         
-        checkpoint_weight_per = self.get_config('CheckpointWeightPer', 0.5)
+        checkpoint_weight_per = self._checkpoint_weight_per
         checkpoint_weight_per_result = checkpoint_weight_per > random.random()
         print.Value('CheckpointWeightPer', checkpoint_weight_per, checkpoint_weight_per_result)
         
@@ -428,7 +590,7 @@ class ComfyUIAutomation:
                 self.checkpoint_name = random.choice(checkpoint_file_names)
                 print.Warn('no WeightCheckpoint')
         else:
-            sub_checkpoint = [x for x in checkpoint_file_names if x not in weight_checkpoint.keys()]
+            sub_checkpoint = self.get_now('SubCheckpointNames', default=())
             print.Value('SubCheckpoint', len(sub_checkpoint))
             
             if len(sub_checkpoint) > 0:
@@ -448,7 +610,7 @@ class ComfyUIAutomation:
     
     def char_change(self):
         """Char를 선택합니다."""
-        no_char_per = self.get_config('noCharPer', 0.5)
+        no_char_per = self._no_char_per
         r = random.random()
         self.no_char = no_char_per > r
         print.Value('noCharPer', no_char_per, r, self.no_char)
@@ -477,7 +639,7 @@ class ComfyUIAutomation:
                     weight = max(no_char_get_db_weight_min, min(no_char_get_db_weight_max - count, no_char_get_db_weight_max))
                     db_weights[char_name] = weight
                 
-                print.Value('DB weights (Char)', len(db_weights), dict(list(db_weights.items())[:5]))
+                print.Value('DB weights (Char)', len(db_weights), dict(islice(db_weights.items(), 5)))
                 
                 if db_weights:
                     self.char_name = random_weight_count(db_weights)[0]
@@ -493,7 +655,7 @@ class ComfyUIAutomation:
             self.char_path = char_file_lists[0] if char_file_lists else None
             print.Value('char_path', self.char_path)
         else:
-            char_weight_per = self.get_config('CharWeightPer', 0.5)
+            char_weight_per = self._char_weight_per
             r = random.random()
             char_weight_per_result = char_weight_per > r
             print.Value('CharWeightPer', char_weight_per, r, char_weight_per_result)
@@ -505,7 +667,7 @@ class ComfyUIAutomation:
                     print.Warn('no WeightChar')
                     self.char_name = random.choice(char_file_names) if char_file_names else None
             else:
-                sub_char = [x for x in char_file_names if x not in weight_char.keys()]
+                sub_char = self.get_now('SubCharNames', default=())
                 print.Value('SubChar', len(sub_char))
                 
                 if len(sub_char) > 0:
@@ -524,7 +686,7 @@ class ComfyUIAutomation:
         self.tive_weight = {}
         self.loras_set = set()
         
-        no_lora_per = self.get_config('noLoraPer', 0.5)
+        no_lora_per = self._no_lora_per
         r = random.random()
         self.no_lora = no_lora_per > r
         print.Value('noLoraPer', no_lora_per, r, self.no_lora)
@@ -554,7 +716,7 @@ class ComfyUIAutomation:
                     weight = max(no_lora_get_db_weight_min, min(no_lora_get_db_weight_max - count, no_lora_get_db_weight_max))
                     db_weights[lora_name] = weight
                 
-                print.Value('DB weights (LoRA)', len(db_weights), dict(list(db_weights.items())[:5]))
+                print.Value('DB weights (LoRA)', len(db_weights), dict(islice(db_weights.items(), 5)))
                 
                 if db_weights:
                     # 가중치 기반으로 여러 개 선택
@@ -568,6 +730,7 @@ class ComfyUIAutomation:
             return
         
         weight_lora = self.get_now('WeightLora', default={})
+        tive_weight = self.tive_weight
         
         for k1, v1 in weight_lora.items():
             print.Value('LoraChange', k1, len(v1))
@@ -622,14 +785,19 @@ class ComfyUIAutomation:
                 loras_set_tmp.update(l)
             
             # tive_weight 업데이트
-            for k2 in loras_set_tmp:
-                update_dict_key(self.tive_weight, tive_weight_tmp[k2], 'positive')
-                update_dict_key(self.tive_weight, tive_weight_tmp[k2], 'negative')
+            # WeightLora 원본이 다음 병합 때 수정되지 않도록 항상 새 딕셔너리에 병합
+            if loras_set_tmp:
+                tive_positive = tive_weight.setdefault('positive', {})
+                tive_negative = tive_weight.setdefault('negative', {})
+                for k2 in loras_set_tmp:
+                    v2 = tive_weight_tmp[k2]
+                    update_dict(tive_positive, v2.get('positive'))
+                    update_dict(tive_negative, v2.get('negative'))
             
             print.Value('lorasSetTmp', k1, loras_set_tmp)
-            self.loras_set = self.loras_set.union(loras_set_tmp)
+            self.loras_set |= loras_set_tmp
         
-        if self.get_config("LoraChangePrint", False):
+        if self._lora_change_print:
             print.Config('positiveDics', self.positive_dics)
             print.Config('negativeDics', self.negative_dics)
         print.Value('lorasSet', self.loras_set)
@@ -640,7 +808,7 @@ class ComfyUIAutomation:
     
     def set_workflow(self, node: str, key: str, value: Any) -> bool:
         """워크플로우에 값을 설정합니다."""
-        if self.get_config('SetWorkflowPrint', False):
+        if self._set_workflow_print:
             print.Config('SetWorkflow', node, key, value)
         return set_exists(self.workflow_api, value, node, "inputs", key) is not None
     
@@ -649,9 +817,17 @@ class ComfyUIAutomation:
         """워크플로우에 랜덤 값을 설정합니다."""
         setup_workflow = self.get_now('setupWorkflow', default={})
         
+        # 노드별 설정은 키마다 다시 찾지 않도록 한 번만 가져옴
+        node_setups = [get_nested(setup_workflow, name, node)
+                       for name in ('workflow', 'workflow_scale', 'workflow_min', 'workflow_max')]
+        sw_workflow, sw_scale, sw_min, sw_max = [d if isinstance(d, dict) else {} for d in node_setups]
+        
+        inputs = get_nested(self.workflow_api, node, "inputs")
+        if not isinstance(inputs, dict):
+            inputs = {}
+        
         for k in key_list:
-            v = self.get_workflow(node, k)
-            v = get_nested(setup_workflow, 'workflow', node, k, default=v)
+            v = sw_workflow.get(k, inputs.get(k))
             
             if func:
                 v = func(v, k)
@@ -659,17 +835,17 @@ class ComfyUIAutomation:
             if random_func:
                 v = random_func(v)
             
-            s = get_nested(setup_workflow, 'workflow_scale', node, k)
+            s = sw_scale.get(k)
             if s:
                 s = random_min_max(s)
                 v *= s
             
-            m = get_nested(setup_workflow, 'workflow_min', node, k)
+            m = sw_min.get(k)
             if m:
                 m = random_min_max(m)
                 v = max(v, m)
             
-            m = get_nested(setup_workflow, 'workflow_max', node, k)
+            m = sw_max.get(k)
             if m:
                 m = random_min_max(m)
                 v = min(v, m)
@@ -723,45 +899,37 @@ class ComfyUIAutomation:
         """KSampler를 설정합니다."""
         self.set_workflow('KSampler', 'seed', seed_int())
         
-        ksampler_inputs = get_nested(self.workflow_api, 'KSampler', "inputs", default={})
-        l = get_type_list(ksampler_inputs, (int, float), (bool,))
-        self.set_workflow_func_random2('KSampler', l, random_min_max, self.set_ksampler_sub)
-        
-        l = get_type_list(ksampler_inputs, (str, bool))
-        self.set_workflow_func_random2('KSampler', l, random_weight, self.set_ksampler_sub)
+        numeric_keys, string_keys = self.get_now('workflow_key_types', 'KSampler', default=((), ()))
+        self.set_workflow_func_random2('KSampler', numeric_keys, random_min_max, self.set_ksampler_sub)
+        self.set_workflow_func_random2('KSampler', string_keys, random_weight, self.set_ksampler_sub)
     
     def set_setup_workflow_to_workflow_api(self):
         """워크플로우 API에 setupWorkflow.yml 값을 설정합니다."""
-        exclude_nodes = set(self.get_config('excludeNode', []))
-        workflow_nodes = set(self.workflow_api.keys()) - exclude_nodes
+        exclude_nodes = self._exclude_nodes
         
-        for k in workflow_nodes:
-            self.set_workflow(k, 'seed', seed_int())
-            v = self.workflow_api.get(k, {})
-            inputs = v.get("inputs", {})
+        for k, node in self.workflow_api.items():
+            if k in exclude_nodes:
+                continue
             
-            l = get_type_list(inputs, (int, float), (bool,))
-            self.set_workflow_func_random2(k, l, random_min_max)
+            # seed 입력이 있는 노드에만 시드를 생성
+            if 'seed' in self._node_inputs(node):
+                self.set_workflow(k, 'seed', seed_int())
             
-            l = get_type_list(inputs, (str, bool))
-            self.set_workflow_func_random2(k, l, random_weight)
-    
-    def set_dic_checkpoint_yml_to_workflow_api_sub(self, node: str, k: str) -> Any:
-        """Checkpoint YML을 워크플로우 API에 설정하는 서브 함수."""
-        return self.get_now('dicCheckpointYml', self.checkpoint_name, node, k)
+            numeric_keys, string_keys = self.get_now('workflow_key_types', k, default=((), ()))
+            self.set_workflow_func_random2(k, numeric_keys, random_min_max)
+            self.set_workflow_func_random2(k, string_keys, random_weight)
     
     def set_dic_checkpoint_yml_to_workflow_api(self):
         """Checkpoint YML을 워크플로우 API에 설정합니다."""
         dic_checkpoint_yml = self.get_now('dicCheckpointYml', self.checkpoint_name, default={})
         
         for k, v in dic_checkpoint_yml.items():
-            if k in self.workflow_api:
-                inputs = get_nested(self.workflow_api, k, "inputs", default={})
-                l = get_type_list(inputs, (int, float), (bool,))
-                self.set_workflow_func_random3(k, l, self.set_dic_checkpoint_yml_to_workflow_api_sub, random_min_max)
-                
-                l = get_type_list(inputs, (str, bool))
-                self.set_workflow_func_random3(k, l, self.set_dic_checkpoint_yml_to_workflow_api_sub, random_weight)
+            if k in self.workflow_api and isinstance(v, dict):
+                # 노드별 설정 딕셔너리(v)에서 바로 값을 가져옴
+                func = lambda node, key, node_dic=v: node_dic.get(key)
+                numeric_keys, string_keys = self.get_now('workflow_key_types', k, default=((), ()))
+                self.set_workflow_func_random3(k, numeric_keys, func, random_min_max)
+                self.set_workflow_func_random3(k, string_keys, func, random_weight)
     
     def set_save_image(self):
         """이미지 저장 설정을 합니다."""
@@ -772,7 +940,7 @@ class ComfyUIAutomation:
                f"{self.checkpoint_name}{tcp}/"
                f"{self.char_name}{tch}/"
                f"{self.checkpoint_name}-{self.char_name}-"
-               f"{time.strftime('%Y%m%d-%H%M%S')}-{self.total}")
+               f"{self._get_timestamp()}-{self.total}")
         
         self.set_workflow('SaveImage1', 'filename_prefix', ff + "-1")
         self.set_workflow('SaveImage2', 'filename_prefix', ff + "-2")
@@ -782,13 +950,22 @@ class ComfyUIAutomation:
             # print('SaveImage1', pop_nested(self.workflow_api, 'SaveImage1', "inputs", 'images'))
             pop_nested(self.workflow_api, 'SaveImage1', "inputs", 'images')
     
+    def _get_timestamp(self) -> str:
+        """파일명용 타임스탬프를 반환합니다. 초가 바뀔 때만 다시 포맷합니다."""
+        now = int(time.time())
+        if now != self._timestamp_sec:
+            self._timestamp_sec = now
+            self._timestamp_str = time.strftime('%Y%m%d-%H%M%S', time.localtime(now))
+        return self._timestamp_str
+    
     def set_tive(self, num_name: str, dic: Dict, reset: bool = False):
         """태그를 설정합니다."""
         if reset:
             self.positive_dics.pop(num_name, None)
             self.negative_dics.pop(num_name, None)
         
-        if self.get_config("setTivePrint", False):
+        set_tive_print = self.get_config("setTivePrint", False)
+        if set_tive_print:
             print.Config('SetTive', num_name, dic)
         
         if dic:
@@ -800,7 +977,7 @@ class ComfyUIAutomation:
             s = self.negative_dics.setdefault(num_name, {})
             update_dict(s, d)
         else:
-            if self.get_config("setTivePrint", False):
+            if set_tive_print:
                 print.Warn(f'SetTive no: {num_name}')
     
     def set_wildcard(self):
@@ -816,32 +993,37 @@ class ComfyUIAutomation:
         
         positive = {}
         negative = {}
-        
-        for k in self.get_config("SetWildcardSort", ['setup', 'Checkpoint', 'Char', 'Weight', 'Lora']):
-            update_dict(positive, self.positive_dics.get(k, {}))
-            update_dict(negative, self.negative_dics.get(k, {}))
-        
-        import yaml
-        yaml_data = yaml.dump(positive, allow_unicode=True)
+        positive_dics = self.positive_dics
+        negative_dics = self.negative_dics
+        
+        # 값은 ','로 이어 붙일 문자열이므로 얕은 병합으로 충분함
+        for k in self.get_config("SetWildcardSort", self.SET_WILDCARD_SORT):
+            src = positive_dics.get(k)
+            if src:
+                positive.update(src)
+            src = negative_dics.get(k)
+            if src:
+                negative.update(src)
+        
+        yaml_data = yaml.dump(positive, Dumper=SafeDumper, allow_unicode=True,
+                              default_flow_style=False, sort_keys=False)
         self.set_workflow('PrimitiveStringMultilineP', 'value', yaml_data)
         
-        yaml_data = yaml.dump(negative, allow_unicode=True)
+        yaml_data = yaml.dump(negative, Dumper=SafeDumper, allow_unicode=True,
+                              default_flow_style=False, sort_keys=False)
         self.set_workflow('PrimitiveStringMultilineN', 'value', yaml_data)
         
-        lpositive = list(positive.values())
-        lpositive.insert(0, '/**/')
-        lpositive.append('/**/')
-        lnegative = list(negative.values())
-        lnegative.insert(0, '/**/')
-        lnegative.append('/**/')
+        lpositive = ['/**/', *positive.values(), '/**/']
+        lnegative = ['/**/', *negative.values(), '/**/']
         
         if random_weight(self.get_config("shuffleWildcard", [False, True])):
-            if self.get_config("shuffleWildcardPrint", False):
+            shuffle_wildcard_print = self.get_config("shuffleWildcardPrint", False)
+            if shuffle_wildcard_print:
                 print.Config('positive', lpositive)
                 print.Config('negative', lnegative)
             random.shuffle(lpositive)
             random.shuffle(lnegative)
-            if self.get_config("shuffleWildcardPrint", False):
+            if shuffle_wildcard_print:
                 print.Config('positive (shuffled)', lpositive)
                 print.Config('negative (shuffled)', lnegative)
         
@@ -849,8 +1031,8 @@ class ComfyUIAutomation:
         negative_wildcard = ",".join(lnegative)
         
         if self.get_config("setWildcardDicPrint", False):
-            print.Config('negativeDics', self.negative_dics)
-            print.Config('positiveDics', self.positive_dics)
+            print.Config('negativeDics', negative_dics)
+            print.Config('positiveDics', positive_dics)
         if self.get_config("setWildcardTivePrint", False):
             print.Config('negative', negative)
             print.Config('positive', positive)
@@ -863,24 +1045,33 @@ class ComfyUIAutomation:
         self.set_workflow('positiveWildcard', 'seed', seed_int())
         self.set_workflow('negativeWildcard', 'seed', seed_int())
     
-    def set_lora_sub(self, k: str) -> Any:
-        """LoRA 서브 함수."""
-        v = self.get_now('setupWorkflow', 'loraDefault', k)
-        v = self.get_now('dicLoraYml', self.lora_tmp, k, default=v)
-        return v
+    def set_lora_sub(self, lora_dic: Dict, k: str) -> Any:
+        """LoRA 서브 함수. (lora_dic: dicLoraYml의 현재 LoRA 설정)"""
+        if k in lora_dic:
+            return lora_dic[k]
+        return self.get_now('setupWorkflow', 'loraDefault', k)
+    
+    @staticmethod
+    def _node_inputs(node: Any) -> Dict:
+        """워크플로우 노드의 inputs 딕셔너리를 반환합니다. (없으면 빈 딕셔너리)"""
+        if isinstance(node, dict):
+            inputs = node.get('inputs')
+            if isinstance(inputs, dict):
+                return inputs
+        return {}
     
     def set_lora(self):
         """LoRA를 설정합니다."""
-        lora_loader = get_nested(self.workflow_api, 'LoraLoader')
-        lora_loader_next = lora_loader
-        lora_loader_next_key = 'LoraLoader'
-        lora_loader_key = 'LoraLoader'
+        workflow_api = self.workflow_api
+        lora_loader = workflow_api.get('LoraLoader')
+        # 이전 노드의 inputs를 직접 참조해서 model/clip 연결을 바꿈
+        lora_loader_next_inputs = self._node_inputs(lora_loader)
         
-        model_sampling_discrete = self.get_workflow(lora_loader_next_key, 'model')
+        model_sampling_discrete = lora_loader_next_inputs.get('model')
         if isinstance(model_sampling_discrete, list):
             model_sampling_discrete = model_sampling_discrete[0]
         
-        checkpoint_loader_simple = self.get_workflow(lora_loader_next_key, 'clip')
+        checkpoint_loader_simple = lora_loader_next_inputs.get('clip')
         if isinstance(checkpoint_loader_simple, list):
             checkpoint_loader_simple = checkpoint_loader_simple[0]
         
@@ -888,56 +1079,75 @@ class ComfyUIAutomation:
             self.tive_lora = self.get_config('noLoraWildcard', {})
         else:
             self.tive_lora = {}
+            lora_file_names_set = self._get_member_set(self.checkpoint_type, 'LoraFileNames')
+            lora_file_dics = self.get_now('LoraFileDics', default={})
+            dic_lora_yml = self.get_now('dicLoraYml', default={})
+            
+            # LoRA마다 deepcopy 하는 대신 한 번 직렬화해 두고 orjson.loads로 복제
+            # (루프 안에서 바뀌는 model/clip 입력은 복제본에서 다시 덮어씀)
+            try:
+                lora_loader_blob = orjson.dumps(lora_loader)
+            except TypeError:
+                lora_loader_blob = None
+            
             for self.lora_tmp in self.loras_set:
-                if self.lora_tmp not in self.get_now('LoraFileNames', default=[]):
+                if self.lora_tmp not in lora_file_names_set:
                     print.Warn('SetLora no', self.lora_tmp)
                     continue
                 
                 self.lora_num += 1
                 
-                dic = self.get_now('dicLoraYml', self.lora_tmp, default={})
-                update_dict(self.tive_lora, dic)
+                # LoRA 설정은 루프마다 한 번만 찾아서 서브 함수에 넘김
+                lora_dic = dic_lora_yml.get(self.lora_tmp)
+                if not isinstance(lora_dic, dict):
+                    lora_dic = {}
+                update_dict(self.tive_lora, lora_dic)
+                set_lora_sub = functools.partial(self.set_lora_sub, lora_dic)
                 
                 lora_loader_tmp_key = f'LoraLoader-{self.lora_tmp}'
-                lora_loader_tmp = copy.deepcopy(lora_loader)
-                set_nested(self.workflow_api, lora_loader_tmp, lora_loader_tmp_key)
+                if lora_loader_blob is not None:
+                    lora_loader_tmp = orjson.loads(lora_loader_blob)
+                else:
+                    lora_loader_tmp = copy.deepcopy(lora_loader)
+                workflow_api[lora_loader_tmp_key] = lora_loader_tmp
+                lora_loader_tmp_inputs = self._node_inputs(lora_loader_tmp)
                 
-                model_input = self.get_workflow(lora_loader_tmp_key, 'model')
+                model_input = lora_loader_tmp_inputs.get('model')
                 if isinstance(model_input, list):
                     model_input[0] = model_sampling_discrete
                 
-                clip_input = self.get_workflow(lora_loader_tmp_key, 'clip')
+                clip_input = lora_loader_tmp_inputs.get('clip')
                 if isinstance(clip_input, list):
                     clip_input[0] = checkpoint_loader_simple
                 
                 self.set_workflow(lora_loader_tmp_key, 'seed', seed_int())
                 self.set_workflow(lora_loader_tmp_key, 'lora_name', 
-                                  self.get_now('LoraFileDics', self.lora_tmp))
+                                  lora_file_dics.get(self.lora_tmp))
                 
                 self.set_workflow_func_random(lora_loader_tmp_key,
                                                ['strength_model', 'strength_clip', 'A', 'B'],
-                                               self.set_lora_sub,
+                                               set_lora_sub,
                                                random_min_max)
                 self.set_workflow_func_random(lora_loader_tmp_key,
                                                ['preset', 'block_vector'],
-                                               self.set_lora_sub,
+                                               set_lora_sub,
                                                random_weight)
                 
-                model_input = self.get_workflow(lora_loader_next_key, 'model')
+                model_input = lora_loader_next_inputs.get('model')
                 if isinstance(model_input, list):
                     model_input[0] = lora_loader_tmp_key
                 
-                clip_input = self.get_workflow(lora_loader_next_key, 'clip')
+                clip_input = lora_loader_next_inputs.get('clip')
                 if isinstance(clip_input, list):
                     clip_input[0] = lora_loader_tmp_key
                 
-                lora_loader_next = lora_loader_tmp
-                lora_loader_next_key = lora_loader_tmp_key
+                lora_loader_next_inputs = lora_loader_tmp_inputs
     
-    def set_char_sub(self, k: str) -> Any:
-        """Char 서브 함수."""
-        return self.get_now('dicLoraYml', self.char_name, k,
-                           default=self.get_now('setupWorkflow', 'charDefault', k))
+    def set_char_sub(self, char_dic: Dict, k: str) -> Any:
+        """Char 서브 함수. (char_dic: dicLoraYml의 현재 Char 설정)"""
+        if k in char_dic:
+            return char_dic[k]
+        return self.get_now('setupWorkflow', 'charDefault', k)
     
     def set_char(self):
         """Char를 설정합니다."""
@@ -949,59 +1159,104 @@ class ComfyUIAutomation:
             self.set_workflow('LoraLoader', 'strength_clip', 0.0)
             self.tive_char = self.get_config('noCharWildcard', {})
         else:
+            char_dic = self.get_now('dicLoraYml', self.char_name, default={})
+            set_char_sub = functools.partial(self.set_char_sub,
+                                             char_dic if isinstance(char_dic, dict) else {})
+            
             self.set_workflow_func_random('LoraLoader',
                                           ['strength_model', 'strength_clip', 'A', 'B'],
-                                          self.set_char_sub,
+                                          set_char_sub,
                                           random_min_max)
             self.set_workflow_func_random('LoraLoader',
                                           ['preset', 'block_vector'],
-                                          self.set_char_sub,
+                                          set_char_sub,
                                           random_weight)
-            self.tive_char = self.get_now('dicLoraYml', self.char_name, default={})
+            self.tive_char = char_dic
     
     def copy_workflow_api(self):
         """워크플로우 API를 복사합니다."""
+        workflow_api_blob = self.get_now('workflow_api_blob')
+        if workflow_api_blob is not None:
+            self.workflow_api = orjson.loads(workflow_api_blob)
+            return
+        
+        # JSON으로 직렬화할 수 없는 워크플로우는 deepcopy 사용
         workflow_api = self.get_now('workflow_api', default={})
         if workflow_api:
             self.workflow_api = copy.deepcopy(workflow_api)
         else:
             self.workflow_api = {}
     
+    def _get_member_set(self, checkpoint_type: str, key: str, items: Optional[List] = None) -> Set:
+        """
+        목록(FileLists / FileNames)의 멤버 검사용 set을 가져옵니다.
+        
+        type_dics[checkpoint_type][f'{key}Set']에 (원본 목록, set)으로 저장해 두고,
+        목록이 다시 스캔되어 다른 객체로 바뀌었으면 새로 만듭니다.
+        
+        Args:
+            checkpoint_type: 체크포인트 타입
+            key: 목록 키
+            items: 목록 (None이면 type_dics에서 가져옴)
+        
+        Returns:
+            목록과 같은 내용의 set
+        """
+        if items is None:
+            items = get_nested(self.type_dics, checkpoint_type, key, default=[])
+        
+        cached = get_nested(self.type_dics, checkpoint_type, f'{key}Set')
+        if cached is not None and cached[0] is items:
+            return cached[1]
+        
+        items_set = set(items)
+        set_nested(self.type_dics, (items, items_set), checkpoint_type, f'{key}Set')
+        return items_set
+    
     def update_safetensors(self, path: Path, checkpoint_type: str, event_type: str,
-                          config_key: str, dics_key: str, lists_key: str, names_key: str):
+                          base_path: Path, dics_key: str, lists_key: str, names_key: str):
         """SafeTensors 파일 목록을 업데이트합니다."""
-        config_path = Path(self.get_config(config_key))
-        rpath = path.relative_to(config_path)
+        rpath = path.relative_to(base_path)
         name = rpath.stem
         print.Value(path, rpath, name)
         
-        file_dics = self.get_now(dics_key, default={})
-        file_lists = self.get_now(lists_key, default=[])
-        file_names = self.get_now(names_key, default=[])
+        # 현재 선택된 타입이 아니라 이벤트가 발생한 타입의 목록을 수정
+        file_dics = get_nested(self.type_dics, checkpoint_type, dics_key, default={})
+        file_lists = get_nested(self.type_dics, checkpoint_type, lists_key, default=[])
+        file_names = get_nested(self.type_dics, checkpoint_type, names_key, default=[])
+        file_lists_set = self._get_member_set(checkpoint_type, lists_key, file_lists)
+        file_names_set = self._get_member_set(checkpoint_type, names_key, file_names)
         spath = str(rpath)
         
         if event_type in ['deleted', 'modified']:
             file_dics.pop(name, None)
-            if spath in file_lists:
+            if spath in file_lists_set:
                 file_lists.remove(spath)
-            if name in file_names:
+                file_lists_set.discard(spath)
+            if name in file_names_set:
                 file_names.remove(name)
+                file_names_set.discard(name)
         
         if event_type in ['created', 'modified']:
             file_dics[name] = rpath
-            if spath not in file_lists:
+            if spath not in file_lists_set:
                 file_lists.append(spath)
-            if name not in file_names:
+                file_lists_set.add(spath)
+            if name not in file_names_set:
                 file_names.append(name)
+                file_names_set.add(name)
         
-        self.set_now(file_dics, dics_key)
-        self.set_now(file_lists, lists_key)
-        self.set_now(file_names, names_key)
+        set_nested(self.type_dics, file_dics, checkpoint_type, dics_key)
+        set_nested(self.type_dics, file_lists, checkpoint_type, lists_key)
+        set_nested(self.type_dics, file_names, checkpoint_type, names_key)
+        
+        if names_key in self._SUB_NAMES_KEYS:
+            self._update_sub_names(checkpoint_type, names_key)
     
     def update_safetensors_char(self, path: Path, checkpoint_type: str, event_type: str):
         """Char SafeTensors 파일 목록을 업데이트합니다."""
         self.update_safetensors(path, checkpoint_type, event_type,
-                               'LoraPath',
+                               self._lora_path,
                                'CharFileDics',
                                'CharFileLists',
                                'CharFileNames')
@@ -1009,7 +1264,7 @@ class ComfyUIAutomation:
     def update_safetensors_etc(self, path: Path, checkpoint_type: str, event_type: str):
         """Etc SafeTensors 파일 목록을 업데이트합니다."""
         self.update_safetensors(path, checkpoint_type, event_type,
-                               'LoraPath',
+                               self._lora_path,
                                'LoraFileDics',
                                'LoraFileLists',
                                'LoraFileNames')
@@ -1017,7 +1272,7 @@ class ComfyUIAutomation:
     def update_safetensors_checkpoint(self, path: Path, checkpoint_type: str, event_type: str):
         """Checkpoint SafeTensors 파일 목록을 업데이트합니다."""
         self.update_safetensors(path, checkpoint_type, event_type,
-                               'CheckpointPath',
+                               self._checkpoint_path,
                                'CheckpointFileDics',
                                'CheckpointFileLists',
                                'CheckpointFileNames')
@@ -1025,7 +1280,7 @@ class ComfyUIAutomation:
     def run(self):
         """메인 실행 루프"""
         try:
-            self.config_loader.reload()
+            self._reload_config()
             self.init(db=True)
             
             # 파일 감시 시작
@@ -1042,7 +1297,7 @@ class ComfyUIAutomation:
             )
             file_observer.watch(
                 self.get_config('LoraPath'),
-                FileEventHandler(self._lora_path_callback),
+                FileEventHandler(self._lora_path_callback, ignore_patterns=FFS_IGNORE_PATTERNS),
                 recursive=True
             )
             file_observer.watch(
@@ -1066,14 +1321,17 @@ class ComfyUIAutomation:
                 self.db.json_to_xlsx()
             except Exception as e:
                 print.exception(show_locals=True)
+            try:
+                self.db.close()
+            except Exception as e:
+                print.exception(show_locals=True)
             print.save_html()
             print.Info(' === finally === ')
     
     def _loop(self):
         """메인 루프"""
         while True:
-            self.config_loader.reload()
-            self.config = self.config_loader.config
+            self._reload_config()
             
             # 설정 확인
             if self.get_config('수정 안해서 작동 안시킴', False):
@@ -1124,13 +1382,14 @@ class ComfyUIAutomation:
             self.queue_loop = random_min_max(self.get_config("queueLoop", [1, 1]))
             
             self.total += 1
-            elapsed = datetime.timedelta(seconds=(time.time() - self.time_start))
+            elapsed_h, elapsed_s = divmod(int(time.monotonic() - self.time_start), 3600)
+            elapsed_m, elapsed_s = divmod(elapsed_s, 60)
             
             print(f"{self.total}, "
                   f"{self.checkpoint_loop_cnt}/{self.checkpoint_loop}, "
                   f"{self.char_loop_cnt}/{self.char_loop}, "
                   f"{self.queue_loop_cnt}/{self.queue_loop}, "
-                  f"{elapsed}, "
+                  f"{elapsed_h}:{elapsed_m:02d}:{elapsed_s:02d}, "
                   f"{self.checkpoint_name}, "
                   f"{self.char_name}, "
                   f"{self.checkpoint_type}")
@@ -1182,23 +1441,60 @@ class ComfyUIAutomation:
         # 정상적으로 전송 완료
         return True
     
+    def _queue_safetensors_update(self, update_func, path: Path, checkpoint_type: str, event_type: str):
+        """
+        SafeTensors 파일 이벤트를 잠시 모아 둡니다.
+        
+        파일 하나에 여러 이벤트(created + modified 등)가 연달아 오므로,
+        마지막 이벤트 후 SAFETENSORS_DEBOUNCE초 동안 새 이벤트가 없으면 경로별로 한 번만 처리합니다.
+        opened/closed 등 목록과 상관없는 이벤트는 모으지 않습니다.
+        """
+        if event_type not in ('created', 'deleted', 'modified'):
+            return
+        
+        with self._pending_lock:
+            self._pending_safetensors[path] = (update_func, checkpoint_type)
+            
+            if self._pending_timer is not None:
+                self._pending_timer.cancel()
+            self._pending_timer = threading.Timer(self.SAFETENSORS_DEBOUNCE, self._flush_safetensors_updates)
+            self._pending_timer.daemon = True
+            self._pending_timer.start()
+    
+    def _flush_safetensors_updates(self):
+        """
+        모아 둔 SafeTensors 파일 이벤트를 처리합니다.
+        
+        마지막 이벤트 종류 대신 지금 파일이 있는지로 추가/삭제를 정합니다.
+        """
+        with self._pending_lock:
+            pending = self._pending_safetensors
+            self._pending_safetensors = {}
+            self._pending_timer = None
+        
+        for path, (update_func, checkpoint_type) in pending.items():
+            try:
+                update_func(path, checkpoint_type, 'created' if path.exists() else 'deleted')
+            except Exception as e:
+                print.exception(show_locals=True)
+    
     def _data_path_callback(self, event: FileSystemEvent):
         """데이터 경로 변경 콜백"""
         try:
             path = Path(event.src_path)
-            config_path = self.get_config('dataPath')
+            config_path = self._data_path
             
             if self.get_config('CallbackPrint', False):
                 print.Value('dataPath', config_path)
             
-            if fnmatch.fnmatch(str(path), str(Path(config_path) / '*')):
+            if config_path in path.parents:
                 rel = path.relative_to(config_path)
                 if self.get_config('CallbackPrint', False):
                     print.Value('rel.parts', rel.parts)
                 
                 if len(rel.parts) > 0:
                     r0 = rel.parts[0]
-                    if r0 in self.checkpoint_types:
+                    if r0 in self.checkpoint_types_set:
                         if len(rel.parts) > 1:
                             r1 = rel.parts[1]
                             if r1 == 'setupWildcard.yml':
@@ -1246,8 +1542,7 @@ class ComfyUIAutomation:
                         return
                     if r0 == 'config.yml':
                         print.Value('config.yml ok', event)
-                        self.config_loader.reload()
-                        self.config = self.config_loader.config
+                        self._reload_config()
                         return
                 
                 if self.get_config('CallbackPrint', False):
@@ -1259,22 +1554,23 @@ class ComfyUIAutomation:
         """Checkpoint 경로 변경 콜백"""
         try:
             path = Path(event.src_path)
-            config_path = self.get_config('CheckpointPath')
+            config_path = self._checkpoint_path
             
-            if fnmatch.fnmatch(str(path), str(Path(config_path) / '*.safetensors')):
+            if os.path.normcase(path.suffix) == SAFETENSORS_SUFFIX and config_path in path.parents:
                 print.Value('CheckpointPathCallback', event)
-                rel = path.relative_to(Path(config_path))
+                rel = path.relative_to(config_path)
                 
                 if len(rel.parts) >= 1:
                     r0 = rel.parts[0]
-                    if r0 not in self.checkpoint_types:
+                    if r0 not in self.checkpoint_types_set:
                         if self.get_config('CallbackPrint', False):
                             print.Warn('CheckpointPath type', path.parts)
                         return
                     
                     if len(rel.parts) == 2:
                         print.Value('CheckpointPath ok', event, rel)
-                        self.update_safetensors_checkpoint(path, r0, event.event_type)
+                        self._queue_safetensors_update(self.update_safetensors_checkpoint,
+                                                       path, r0, event.event_type)
                         return
                     else:
                         if self.get_config('CallbackPrint', False):
@@ -1286,20 +1582,16 @@ class ComfyUIAutomation:
         """LoRA 경로 변경 콜백"""
         try:
             path = Path(event.src_path)
-            config_path = self.get_config('LoraPath')
+            config_path = self._lora_path
             
-            if fnmatch.fnmatch(str(path), str(Path(config_path) / '*.ffs_db')) or \
-               fnmatch.fnmatch(str(path), str(Path(config_path) / '*.ffs_lock')) or \
-               fnmatch.fnmatch(str(path), str(Path(config_path) / '*.ffs_tmp')):
-                return
-            
-            if fnmatch.fnmatch(str(path), str(Path(config_path) / '*.safetensors')):
+            # FreeFileSync 작업 파일은 FileEventHandler의 ignore_patterns에서 걸러짐
+            if os.path.normcase(path.suffix) == SAFETENSORS_SUFFIX and config_path in path.parents:
                 print.Value('LoraPathCallback', event)
-                rel = path.relative_to(Path(config_path))
+                rel = path.relative_to(config_path)
                 
                 if len(rel.parts) >= 1:
                     r0 = rel.parts[0]
-                    if r0 not in self.checkpoint_types:
+                    if r0 not in self.checkpoint_types_set:
                         if self.get_config('CallbackPrint', False):
                             print.Warn('LoraPath type', path.parts)
                         return
@@ -1308,11 +1600,13 @@ class ComfyUIAutomation:
                     if len(rel.parts) == 3:
                         if rel.parts[1] == 'char':
                             print.Value('LoraPath char ok', event)
-                            self.update_safetensors_char(path, r0, event.event_type)
+                            self._queue_safetensors_update(self.update_safetensors_char,
+                                                           path, r0, event.event_type)
                             return
                         if rel.parts[1] == 'etc':
                             print.Value('LoraPath etc ok', event)
-                            self.update_safetensors_etc(path, r0, event.event_type)
+                            self._queue_safetensors_update(self.update_safetensors_etc,
+                                                           path, r0, event.event_type)
                             return
                     else:
                         if self.get_config('CallbackPrint', False):
@@ -1326,8 +1620,7 @@ class ComfyUIAutomation:
             path = Path(event.src_path)
             if path.name == 'config.yml':
                 print.Value('ConfigCallback', path)
-                self.config_loader.reload()
-                self.config = self.config_loader.config
+                self._reload_config()
         except Exception as e:
             print.exception(show_locals=True)
 
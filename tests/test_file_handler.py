@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+file_handler 테스트
+"""
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.file_handler import get_file_dict_list, get_file_dict_list_multi
+
+
+def _touch(path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.touch()
+
+
+class GetFileDictListMultiTest(unittest.TestCase):
+    """get_file_dict_list_multi가 roots마다 get_file_dict_list를 부른 결과와 같은지 확인"""
+    
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.lora_path = Path(self._tmp.name) / 'lora'
+        self.type_path = self.lora_path / 'IL'
+        _touch(self.type_path / 'Char' / 'a.safetensors')
+        _touch(self.type_path / 'Char' / 'sub' / 'b.safetensors')
+        _touch(self.type_path / 'etc' / 'c.safetensors')
+        _touch(self.type_path / 'top.safetensors')
+        _touch(self.type_path / 'etc' / 'skip.yml')
+    
+    def tearDown(self):
+        self._tmp.cleanup()
+    
+    def _single(self, root: Path):
+        paths_dict, paths_list, names = get_file_dict_list(root, self.lora_path)
+        return paths_dict, sorted(paths_list), sorted(names)
+    
+    def _multi(self, roots):
+        results = get_file_dict_list_multi(self.type_path, roots, self.lora_path)
+        return {
+            key: (paths_dict, sorted(paths_list), sorted(names))
+            for key, (paths_dict, paths_list, names) in results.items()
+        }
+    
+    def test_separate_roots(self):
+        roots = {'Char': self.type_path / 'Char', 'Lora': self.type_path / 'etc'}
+        results = self._multi(roots)
+        for key, root in roots.items():
+            self.assertEqual(results[key], self._single(root))
+        self.assertEqual(results['Char'][2], ['a', 'b'])
+        self.assertEqual(results['Lora'][2], ['c'])
+    
+    def test_nested_roots(self):
+        # LoraCharPath: . 처럼 한 root가 다른 root를 포함하면 양쪽에 모두 들어가야 함
+        roots = {'Char': self.type_path / '.', 'Lora': self.type_path / 'etc'}
+        results = self._multi(roots)
+        self.assertEqual(results['Char'], self._single(self.type_path))
+        self.assertEqual(results['Lora'], self._single(self.type_path / 'etc'))
+        self.assertEqual(results['Char'][2], ['a', 'b', 'c', 'top'])
+    
+    def test_root_case_differs(self):
+        # Windows처럼 대소문자를 구분하지 않는 경로 비교에서 설정 'char'가 폴더 'Char'와 맞아야 함
+        with mock.patch.object(os.path, 'normcase', lambda s: os.fspath(s).lower()):
+            results = self._multi({'Char': self.type_path / 'char'})
+        self.assertEqual(results['Char'][2], ['a', 'b'])
+        self.assertEqual(
+            results['Char'][1],
+            sorted([os.path.join('IL', 'Char', 'a.safetensors'),
+                    os.path.join('IL', 'Char', 'sub', 'b.safetensors')])
+        )
+    
+    def test_root_outside_path(self):
+        other = Path(self._tmp.name) / 'other'
+        _touch(other / 'd.safetensors')
+        results = self._multi({'Lora': other})
+        self.assertEqual(results['Lora'][2], ['d'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,17 +2,34 @@
 """
 ComfyUI API 유틸리티
 """
-import json
 import time
+from pathlib import Path
 from typing import Dict, Any, Optional
-from urllib import request
-from urllib.error import URLError, HTTPError
+from urllib.parse import urlsplit, urlunsplit
+import orjson
+import urllib3
 from rich.progress import Progress
 
-from .dict_utils import convert_paths
+# websocket-client가 없으면 HTTP 폴링만 사용
+try:
+    import websocket
+except ImportError:
+    websocket = None
+
 from .print_log import print, logger
 
 
+# 요청마다 새 TCP 연결을 여는 대신 keep-alive 연결을 재사용
+_http = urllib3.PoolManager(maxsize=4, retries=False)
+
+
+def _orjson_default(o: Any) -> Any:
+    """orjson이 직접 직렬화하지 못하는 Path 객체를 문자열로 변환합니다."""
+    if isinstance(o, Path):
+        return str(o)
+    raise TypeError(f"직렬화할 수 없는 타입: {type(o).__name__}")
+
+
 def queue_prompt(prompt: Dict[str, Any], url: str = "http://127.0.0.1:8188/prompt") -> bool:
     """
     ComfyUI에 프롬프트를 큐에 추가합니다.
@@ -25,11 +42,9 @@ def queue_prompt(prompt: Dict[str, Any], url: str = "http://127.0.0.1:8188/promp
         성공 여부
     """
     try:
-        p = {"prompt": prompt}
-        p = convert_paths(p)
-        data = json.dumps(p).encode('utf-8')
-        
-        req = request.Request(url, data=data)
+        # 따로 한 번 더 순회하지 않고 직렬화하면서 Path를 문자열로 변환
+        data = orjson.dumps({"prompt": prompt}, default=_orjson_default,
+                            option=orjson.OPT_NON_STR_KEYS)
     except TypeError as e:
         print.exception(show_locals=True)
         print.Err("프롬프트 변환 오류:", prompt)
@@ -40,24 +55,96 @@ def queue_prompt(prompt: Dict[str, Any], url: str = "http://127.0.0.1:8188/promp
     
     while True:
         try:
-            request.urlopen(req)
-        except HTTPError as e:
-            print.Err('HTTP 오류 코드:', e.code)
-            logger.exception("HTTPError 발생: %s", e)
+            response = _http.request('POST', url, body=data,
+                                     headers={'Content-Type': 'application/json'})
+        except urllib3.exceptions.HTTPError as e:
+            print.Warn('URL 오류:', e)
+            continue
+        
+        if response.status >= 400:
+            print.Err('HTTP 오류 코드:', response.status)
+            logger.error("HTTPError 발생: %s %s", response.status, response.data[:1000])
             return False
-        except URLError as e:
-            print.Warn('URL 오류:', e.reason)
-        else:
-            break
+        break
     
     print("프롬프트 전송 완료")
     return True
 
 
+def _get_ws_url(url: str) -> str:
+    """
+    프롬프트 API URL로부터 웹소켓 URL을 만듭니다.
+    
+    Args:
+        url: ComfyUI API URL (예: http://127.0.0.1:8188/prompt)
+    
+    Returns:
+        웹소켓 URL (예: ws://127.0.0.1:8188/ws)
+    """
+    parts = urlsplit(url)
+    scheme = 'wss' if parts.scheme == 'https' else 'ws'
+    path = parts.path.rsplit('/', 1)[0] + '/ws'
+    return urlunsplit((scheme, parts.netloc, path, '', ''))
+
+
+def _queue_wait_ws(url: str, max_queue: int) -> bool:
+    """
+    웹소켓의 status 메시지로 큐가 줄어들 때까지 대기합니다.
+    
+    ComfyUI는 접속 직후와 큐가 바뀔 때마다 status 메시지를 보냅니다.
+    
+    Args:
+        url: ComfyUI API URL
+        max_queue: 최대 큐 개수
+    
+    Returns:
+        대기 성공 여부 (False면 HTTP 폴링으로 대체)
+    """
+    if websocket is None:
+        return False
+    
+    try:
+        ws = websocket.create_connection(_get_ws_url(url), timeout=5)
+    except Exception as e:
+        logger.debug("웹소켓 연결 실패, HTTP 폴링 사용: %s", e)
+        return False
+    
+    try:
+        with Progress() as progress:
+            task = progress.add_task("대기 중", total=None)
+            while True:
+                try:
+                    message = ws.recv()
+                except websocket.WebSocketTimeoutException:
+                    continue
+                
+                # 미리보기 이미지 등 바이너리 메시지는 무시
+                if not isinstance(message, str):
+                    continue
+                
+                data = orjson.loads(message)
+                if data.get('type') != 'status':
+                    continue
+                
+                exec_info = data.get('data', {}).get('status', {}).get('exec_info', {})
+                queue_remaining = exec_info.get('queue_remaining', 0)
+                progress.update(task, description=f"대기 중 ({queue_remaining})")
+                
+                if queue_remaining < max_queue:
+                    return True
+    except Exception as e:
+        logger.debug("웹소켓 대기 실패, HTTP 폴링 사용: %s", e)
+        return False
+    finally:
+        ws.close()
+
+
 def queue_prompt_wait(url: str = "http://127.0.0.1:8188/prompt", max_queue: int = 1) -> bool:
     """
     ComfyUI 큐가 지정된 개수 이하가 될 때까지 대기합니다.
     
+    웹소켓(/ws)으로 큐 상태를 받아 대기하고, 사용할 수 없으면 1초마다 HTTP로 폴링합니다.
+    
     Args:
         url: ComfyUI API URL
         max_queue: 최대 큐 개수
@@ -65,28 +152,30 @@ def queue_prompt_wait(url: str = "http://127.0.0.1:8188/prompt", max_queue: int
     Returns:
         오류 발생 여부
     """
+    if _queue_wait_ws(url, max_queue):
+        return False
+    
     try:
         with Progress() as progress:
             while True:
                 if progress.finished:
                     task = progress.add_task("대기 중", total=60)
                 
-                req = request.Request(url)
                 while True:
                     try:
-                        response = request.urlopen(req)
-                    except HTTPError as e:
+                        response = _http.request('GET', url)
+                    except urllib3.exceptions.HTTPError as e:
                         progress.stop()
-                        print.Err('HTTP 오류 코드:', e.code)
-                        return True
-                    except URLError as e:
+                        print.Warn('URL 오류:', e)
+                        continue
+                    
+                    if response.status >= 400:
                         progress.stop()
-                        print.Warn('URL 오류:', e.reason)
-                    else:
-                        break
+                        print.Err('HTTP 오류 코드:', response.status)
+                        return True
+                    break
                 
-                html = response.read().decode("utf-8")
-                data = json.loads(html)
+                data = orjson.loads(response.data)
                 
                 queue_remaining = data.get('exec_info', {}).get('queue_remaining', 0)
                 
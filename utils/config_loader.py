@@ -7,6 +7,12 @@ import yaml
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 
+# libyaml C 확장이 있으면 사용
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 
 class ConfigLoader:
     """설정 파일을 로드하고 관리하는 클래스"""
@@ -22,16 +28,36 @@ class ConfigLoader:
         
         self.config_path = Path(config_path)
         self._config: Dict[str, Any] = {}
+        # 마지막으로 읽은 파일의 (st_mtime_ns, st_size)
+        self._last_stat = None
+        # 실제로 다시 파싱할 때마다 1씩 증가
+        self.version = 0
         self.load()
     
-    def load(self) -> Dict[str, Any]:
-        """설정 파일을 로드합니다."""
-        if not self.config_path.exists():
+    def load(self, force: bool = False) -> Dict[str, Any]:
+        """
+        설정 파일을 로드합니다.
+        
+        파일의 수정 시각과 크기가 마지막으로 읽었을 때와 같으면 다시 파싱하지 않습니다.
+        
+        Args:
+            force: True면 변경 여부와 관계없이 다시 읽음
+        
+        Returns:
+            설정 딕셔너리
+        """
+        try:
+            st = self.config_path.stat()
+        except OSError:
             return {}
         
+        file_stat = (st.st_mtime_ns, st.st_size)
+        if not force and file_stat == self._last_stat:
+            return self._config
+        
         try:
             with open(self.config_path, 'r', encoding='utf-8') as f:
-                self._config = yaml.safe_load(f) or {}
+                self._config = yaml.load(f, Loader=SafeLoader) or {}
             
             # dataPath가 상대 경로인 경우 절대 경로로 변환
             if 'dataPath' in self._config and not os.path.isabs(self._config['dataPath']):
@@ -40,6 +66,8 @@ class ConfigLoader:
                     os.path.join(script_dir, self._config['dataPath'])
                 )
             
+            self._last_stat = file_stat
+            self.version += 1
             return self._config
         except Exception as e:
             print(f"  오류: 설정 파일 읽기 실패: {e}")
@@ -49,9 +77,9 @@ class ConfigLoader:
         """설정 값을 가져옵니다."""
         return self._config.get(key, default)
     
-    def reload(self) -> Dict[str, Any]:
-        """설정 파일을 다시 로드합니다."""
-        return self.load()
+    def reload(self, force: bool = False) -> Dict[str, Any]:
+        """설정 파일을 다시 로드합니다. (변경된 경우에만)"""
+        return self.load(force)
     
     @property
     def config(self) -> Dict[str, Any]:
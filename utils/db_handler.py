@@ -2,37 +2,90 @@
 """
 데이터베이스 핸들러
 """
+import sqlite3
 from pathlib import Path
-from typing import Set, Optional
-from tinydb import TinyDB, Query
-from tinydb.table import Table
-from tinydb.storages import JSONStorage
+from typing import Dict, Set, Optional, Tuple, Any
+import orjson
 
+from .print_log import print
+
+
+# SQLite 파일 헤더 (이전 TinyDB JSON 파일과 구분용)
+SQLITE_HEADER = b'SQLite format 3\x00'
+
+
+def quote_name(name: str) -> str:
+    """SQL 식별자(테이블/컬럼 이름)를 따옴표로 감쌉니다."""
+    return '"' + name.replace('"', '""') + '"'
 
-class UTF8JSONStorage(JSONStorage):
-    """UTF-8 인코딩을 지원하는 JSON 스토리지"""
-    
-    def __init__(self, path, **kwargs):
-        super().__init__(path, encoding='utf-8', **kwargs)
+
+def encode_loras(loras) -> str:
+    """LoRA 목록을 정렬된 JSON 문자열로 저장용 변환합니다."""
+    return orjson.dumps(sorted(loras)).decode('utf-8')
+
+
+def decode_loras(value: str) -> list:
+    """저장된 JSON 문자열을 LoRA 목록으로 되돌립니다."""
+    return orjson.loads(value) if value else []
 
 
 class DatabaseHandler:
     """데이터베이스 핸들러 클래스"""
     
+    # {테이블 종류: 값 컬럼} - 테이블 이름은 f'{checkpoint_type}-{종류}'
+    TABLE_COLUMNS: Dict[str, Tuple[str, ...]] = {
+        'Lora': ('Lora',),
+        'Checkpoint': ('Checkpoint',),
+        'Char': ('Char',),
+        'Loras': ('Loras',),
+        'Combination': ('Checkpoint', 'Char', 'Loras'),
+    }
+    
     def __init__(self):
         self.path: Optional[Path] = None
-        self.db: Optional[TinyDB] = None
-        self.query = Query()
+        self.db: Optional[sqlite3.Connection] = None
+        # 이미 만든 테이블 이름
+        self._tables: Set[str] = set()
+        # {(체크포인트 타입, 테이블 종류): INSERT ... ON CONFLICT 문}
+        self._upsert_sql: Dict[Tuple[str, str], str] = {}
+        # {(체크포인트 타입, 테이블 종류): {값: count}}
+        self._counts_cache: Dict[Tuple[str, str], dict] = {}
+        # 캐시를 만들 때의 PRAGMA data_version (다른 연결이 쓰면 바뀜)
+        self._data_version: Optional[int] = None
     
     def init(self, data_path: str):
         """
         데이터베이스를 초기화합니다.
         
+        count.db가 이전 TinyDB JSON 파일이면 count.db.json으로 옮기고 내용을 가져옵니다.
+        
         Args:
             data_path: 데이터 경로
         """
+        self.close()
+        
         self.path = Path(data_path) / 'count.db'
-        self.db = TinyDB(self.path, storage=UTF8JSONStorage)
+        legacy_path = self._move_legacy_json()
+        
+        # 자동 커밋 모드에서 update()마다 BEGIN ... COMMIT으로 묶음
+        self.db = sqlite3.connect(str(self.path), isolation_level=None)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self._tables = set()
+        self._upsert_sql = {}
+        self._counts_cache = {}
+        self._data_version = None
+        
+        if legacy_path:
+            self._import_legacy_json(legacy_path)
+    
+    def close(self):
+        """데이터베이스를 닫습니다."""
+        if not self.db:
+            return
+        
+        self.db.close()
+        self.db = None
     
     def update(self, checkpoint_type: str, checkpoint: str, char: str, loras: Set[str]):
         """
@@ -47,84 +100,117 @@ class DatabaseHandler:
         if not self.db:
             return
         
-        loras_list = list(loras)
+        loras_json = encode_loras(loras)
         
-        # LoRA 테이블 업데이트
-        lora_table = self.db.table(f'{checkpoint_type}-Lora')
-        for lora in loras:
-            self._update(
-                lora_table,
-                self.query.Lora == lora,
-                {'Lora': lora, 'count': 1}
-            )
+        self.db.execute('BEGIN')
+        try:
+            # LoRA 테이블 업데이트
+            for lora in loras:
+                self._upsert(checkpoint_type, 'Lora', (lora,))
+            
+            # 다른 필드 업데이트
+            self._upsert(checkpoint_type, 'Checkpoint', (checkpoint,))
+            self._upsert(checkpoint_type, 'Char', (char,))
+            self._upsert(checkpoint_type, 'Loras', (loras_json,))
+            
+            # 조합 테이블 업데이트
+            self._upsert(checkpoint_type, 'Combination', (checkpoint, char, loras_json))
+        except Exception:
+            self.db.execute('ROLLBACK')
+            raise
+        self.db.execute('COMMIT')
         
-        # 다른 필드 업데이트
-        fields = {
-            'Checkpoint': checkpoint,
-            'Char': char,
-            'Loras': loras_list
-        }
-        
-        for key, value in fields.items():
-            self._update(
-                self.db.table(f'{checkpoint_type}-{key}'),
-                getattr(self.query, key) == value,
-                {key: value, 'count': 1}
-            )
+        # 이 연결에서 쓴 내용은 data_version에 반영되지 않으므로 직접 무효화
+        self._counts_cache.pop((checkpoint_type, 'Char'), None)
+        self._counts_cache.pop((checkpoint_type, 'Lora'), None)
+    
+    def _ensure_table(self, checkpoint_type: str, kind: str) -> str:
+        """
+        테이블이 없으면 만듭니다.
         
-        # 조합 테이블 업데이트
-        self._update(
-            self.db.table(f'{checkpoint_type}-Combination'),
-            (self.query.Checkpoint == checkpoint) &
-            (self.query.Char == char) &
-            (self.query.Loras == loras_list),
-            {
-                'Checkpoint': checkpoint,
-                'Char': char,
-                'Loras': loras_list,
-                'count': 1
-            }
-        )
+        Args:
+            checkpoint_type: 체크포인트 타입
+            kind: 테이블 종류 (TABLE_COLUMNS의 키)
+        
+        Returns:
+            따옴표로 감싼 테이블 이름
+        """
+        table = quote_name(f'{checkpoint_type}-{kind}')
+        if table not in self._tables:
+            columns = ', '.join(quote_name(c) for c in self.TABLE_COLUMNS[kind])
+            self.db.execute(
+                f'CREATE TABLE IF NOT EXISTS {table} ('
+                + ', '.join(f'{quote_name(c)} TEXT NOT NULL' for c in self.TABLE_COLUMNS[kind])
+                + f', count INTEGER NOT NULL DEFAULT 0, PRIMARY KEY ({columns}))'
+            )
+            self._tables.add(table)
+        return table
     
-    def _update(self, table: Table, condition, new_data: dict):
+    def _upsert(self, checkpoint_type: str, kind: str, values: Tuple[Any, ...], count: int = 1):
         """
-        테이블을 업데이트합니다.
+        행이 있으면 count를 더하고 없으면 추가합니다.
         
         Args:
-            table: 테이블 객체
-            condition: 조건
-            new_data: 새 데이터
-        """
-        result = table.get(condition)
-        if result:
-            new_count = result['count'] + 1
-            table.update({'count': new_count}, doc_ids=[result.doc_id])
-        else:
-            table.insert(new_data)
+            checkpoint_type: 체크포인트 타입
+            kind: 테이블 종류 (TABLE_COLUMNS의 키)
+            values: 값 컬럼 값 (None은 빈 문자열로 저장)
+            count: 더할 횟수
+        """
+        # SQL 문은 테이블마다 한 번만 만들고 재사용
+        sql = self._upsert_sql.get((checkpoint_type, kind))
+        if sql is None:
+            table = self._ensure_table(checkpoint_type, kind)
+            columns = ', '.join(quote_name(c) for c in self.TABLE_COLUMNS[kind])
+            placeholders = ', '.join('?' * (len(self.TABLE_COLUMNS[kind]) + 1))
+            sql = (
+                f'INSERT INTO {table} ({columns}, count) VALUES ({placeholders}) '
+                f'ON CONFLICT({columns}) DO UPDATE SET count = count + excluded.count'
+            )
+            self._upsert_sql[(checkpoint_type, kind)] = sql
+        
+        self.db.execute(sql, (*('' if v is None else str(v) for v in values), count))
     
-    def get_char_counts(self, checkpoint_type: str) -> dict:
+    def _get_counts(self, checkpoint_type: str, kind: str) -> dict:
         """
-        Char 사용 횟수를 가져옵니다.
+        단일 값 테이블의 {값: 사용 횟수}를 가져옵니다.
+        
+        결과는 update()나 다른 프로세스가 쓰기 전까지 캐시하므로 반환값을 수정하지 마세요.
         
         Args:
             checkpoint_type: 체크포인트 타입
+            kind: 테이블 종류 (Char / Lora)
         
         Returns:
-            {char_name: count} 딕셔너리
+            {값: count} 딕셔너리
         """
         if not self.db:
             return {}
         
-        char_table = self.db.table(f'{checkpoint_type}-Char')
-        char_counts = {}
+        data_version = self.db.execute('PRAGMA data_version').fetchone()[0]
+        if data_version != self._data_version:
+            self._counts_cache = {}
+            self._data_version = data_version
         
-        for doc in char_table.all():
-            char_name = doc.get('Char')
-            count = doc.get('count', 0)
-            if char_name:
-                char_counts[char_name] = count
+        key = (checkpoint_type, kind)
+        counts = self._counts_cache.get(key)
+        if counts is None:
+            table = self._ensure_table(checkpoint_type, kind)
+            column = quote_name(self.TABLE_COLUMNS[kind][0])
+            counts = dict(self.db.execute(f"SELECT {column}, count FROM {table} WHERE {column} != ''"))
+            self._counts_cache[key] = counts
+        return counts
+    
+    def get_char_counts(self, checkpoint_type: str) -> dict:
+        """
+        Char 사용 횟수를 가져옵니다.
+        
+        Args:
+            checkpoint_type: 체크포인트 타입
         
-        return char_counts
+        Returns:
+            {char_name: count} 딕셔너리
+        """
+        return self._get_counts(checkpoint_type, 'Char')
     
     def get_lora_counts(self, checkpoint_type: str) -> dict:
         """
@@ -136,22 +222,71 @@ class DatabaseHandler:
         Returns:
             {lora_name: count} 딕셔너리
         """
-        if not self.db:
-            return {}
+        return self._get_counts(checkpoint_type, 'Lora')
+    
+    def _move_legacy_json(self) -> Optional[Path]:
+        """
+        count.db가 이전 TinyDB JSON 파일이면 다른 이름으로 옮깁니다.
         
-        lora_table = self.db.table(f'{checkpoint_type}-Lora')
-        lora_counts = {}
+        Returns:
+            옮긴 파일 경로 (옮기지 않았으면 None)
+        """
+        try:
+            with open(self.path, 'rb') as f:
+                header = f.read(len(SQLITE_HEADER))
+        except OSError:
+            return None
+        
+        if not header or header == SQLITE_HEADER:
+            return None
+        
+        legacy_path = self.path.with_name(self.path.name + '.json')
+        n = 1
+        while legacy_path.exists():
+            legacy_path = self.path.with_name(f'{self.path.name}.{n}.json')
+            n += 1
+        
+        self.path.rename(legacy_path)
+        print.Warn('TinyDB 데이터베이스를 SQLite로 변환합니다:', legacy_path)
+        return legacy_path
+    
+    def _import_legacy_json(self, legacy_path: Path):
+        """
+        이전 TinyDB JSON 파일의 사용 횟수를 가져옵니다.
+        
+        Args:
+            legacy_path: TinyDB JSON 파일 경로
+        """
+        try:
+            data = orjson.loads(legacy_path.read_bytes())
+        except Exception as e:
+            print.exception(show_locals=True)
+            return
         
-        for doc in lora_table.all():
-            lora_name = doc.get('Lora')
-            count = doc.get('count', 0)
-            if lora_name:
-                lora_counts[lora_name] = count
+        self.db.execute('BEGIN')
+        try:
+            for table_name, docs in data.items():
+                checkpoint_type, _, kind = table_name.rpartition('-')
+                if not checkpoint_type or kind not in self.TABLE_COLUMNS or not isinstance(docs, dict):
+                    continue
+                
+                for doc in docs.values():
+                    values = []
+                    for column in self.TABLE_COLUMNS[kind]:
+                        value = doc.get(column)
+                        if column == 'Loras':
+                            value = encode_loras(value or [])
+                        values.append(value)
+                    self._upsert(checkpoint_type, kind, tuple(values), doc.get('count', 0))
+        except Exception:
+            self.db.execute('ROLLBACK')
+            raise
+        self.db.execute('COMMIT')
         
-        return lora_counts
+        print.Info('TinyDB 데이터베이스 변환 완료:', self.path)
     
     def json_to_xlsx(self):
-        """JSON 데이터를 XLSX로 변환합니다."""
+        """데이터베이스 내용을 XLSX로 변환합니다."""
         if not self.path:
             return
         
@@ -160,4 +295,3 @@ class DatabaseHandler:
             json_to_xlsx(self.path)
         except Exception as e:
             print.exception(show_locals=True)
-
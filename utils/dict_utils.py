@@ -2,10 +2,13 @@
 """
 딕셔너리 유틸리티
 """
-import collections
+import collections.abc
 from typing import Dict, Any, Optional
 
 
+_MAPPING = collections.abc.Mapping
+
+
 def get_nested(d: Dict, *keys, default: Any = None) -> Any:
     """
     중첩 딕셔너리에서 키를 안전하게 가져옵니다.
@@ -18,16 +21,16 @@ def get_nested(d: Dict, *keys, default: Any = None) -> Any:
     Returns:
         값 또는 기본값
     """
-    current = d
-    for key in keys[:-1]:
-        current = current.get(key, default)
-        if not isinstance(current, dict):
-            return default
-    
-    if keys and keys[-1] in current:
-        return current[keys[-1]]
+    if not keys:
+        return default
     
-    return default
+    # 대부분 키가 존재하므로 isinstance 검사 대신 예외로 처리
+    try:
+        for key in keys:
+            d = d[key]
+        return d
+    except (KeyError, TypeError, IndexError):
+        return default
 
 
 def set_nested(d: Dict, value: Any, *keys) -> Dict:
@@ -46,8 +49,9 @@ def set_nested(d: Dict, value: Any, *keys) -> Dict:
         return d
     
     temp = d
+    setdefault = dict.setdefault
     for key in keys[:-1]:
-        temp = temp.setdefault(key, {})
+        temp = setdefault(temp, key, {})
     
     temp[keys[-1]] = value
     return d
@@ -65,15 +69,20 @@ def set_exists(d: Dict, value: Any, *keys) -> Optional[Dict]:
     Returns:
         업데이트된 딕셔너리 또는 None
     """
-    current = d
-    for key in keys[:-1]:
-        current = current.get(key)
-        if current is None or not isinstance(current, dict):
-            return None
-    
-    if keys and keys[-1] in current:
-        current[keys[-1]] = value
-        return current
+    if not keys:
+        return None
+    
+    try:
+        current = d
+        for key in keys[:-1]:
+            current = current[key]
+        
+        key = keys[-1]
+        if key in current:
+            current[key] = value
+            return current
+    except (KeyError, TypeError, IndexError):
+        pass
     
     return None
 
@@ -93,16 +102,14 @@ def pop_nested(d: Dict, *keys, default: Any = None) -> Any:
     if len(keys) < 2:
         return default
     
-    current = d
-    for key in keys[:-2]:
-        current = current.get(key)
-        if current is None or not isinstance(current, dict):
-            return default
-    
-    if keys[-2] in current:
-        return current[keys[-2]].pop(keys[-1], default)
+    try:
+        current = d
+        for key in keys[:-1]:
+            current = current[key]
+    except (KeyError, TypeError, IndexError):
+        return default
     
-    return default
+    return current.pop(keys[-1], default)
 
 
 def update_dict(d: Dict, u: Dict) -> Dict:
@@ -119,11 +126,20 @@ def update_dict(d: Dict, u: Dict) -> Dict:
     if u is None:
         return d
     
-    for k, v in u.items():
-        if isinstance(v, collections.abc.Mapping):
-            d[k] = update_dict(d.get(k, {}), v)
-        else:
-            d[k] = v
+    # 재귀 대신 (대상, 원본) 스택으로 순회
+    stack = [(d, u)]
+    while stack:
+        target, source = stack.pop()
+        for k, v in source.items():
+            if isinstance(v, _MAPPING):
+                # 대상에 없으면 새 딕셔너리에 복사 (원본 객체를 공유하지 않음)
+                if k in target:
+                    sub = target[k]
+                else:
+                    sub = target[k] = {}
+                stack.append((sub, v))
+            else:
+                target[k] = v
     
     return d
 
@@ -147,28 +163,3 @@ def update_dict_key(d: Dict, u: Dict, key: str) -> Dict:
             d[key] = u[key]
     
     return d
-
-
-def convert_paths(obj: Any) -> Any:
-    """
-    객체 내의 Path 객체를 문자열로 변환합니다.
-    
-    Args:
-        obj: 변환할 객체
-    
-    Returns:
-        변환된 객체
-    """
-    from pathlib import Path
-    
-    if isinstance(obj, Path):
-        return str(obj)
-    elif isinstance(obj, dict):
-        return {k: convert_paths(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_paths(elem) for elem in obj]
-    elif isinstance(obj, tuple):
-        return tuple(convert_paths(elem) for elem in obj)
-    else:
-        return obj
-
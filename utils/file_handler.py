@@ -3,11 +3,17 @@
 파일 처리 유틸리티
 """
 import os
-import time
+import threading
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler, FileSystemEvent
+from watchdog.events import FileSystemEventHandler, PatternMatchingEventHandler, FileSystemEvent
+
+
+SAFETENSORS_SUFFIX = '.safetensors'
+
+# FreeFileSync 작업 파일
+FFS_IGNORE_PATTERNS = ['*.ffs_db', '*.ffs_lock', '*.ffs_tmp']
 
 
 def get_file_dict_list(path: Path, base_dir: Path = None) -> Tuple[Dict[str, str], List[str], List[str]]:
@@ -24,15 +30,143 @@ def get_file_dict_list(path: Path, base_dir: Path = None) -> Tuple[Dict[str, str
     if base_dir is None:
         base_dir = path
     
-    files = list(path.rglob('*.safetensors')) if path.exists() else []
+    paths_dict = {}
+    paths_list = []
+    names = []
+    
+    root = str(path)
+    base = str(base_dir)
+    prefix = base if base.endswith(os.sep) else base + os.sep
+    prefix_len = len(prefix)
+    suffix_len = len(SAFETENSORS_SUFFIX)
+    
+    # 반복문 안에서 쓰는 메서드/함수는 지역 변수로 바인딩
+    dict_set = paths_dict.__setitem__
+    list_append = paths_list.append
+    names_append = names.append
+    normcase = os.path.normcase
     
-    names = [f.stem for f in files]
-    paths_list = [str(f.relative_to(base_dir)) for f in files]
-    paths_dict = dict(zip(names, paths_list))
+    # rglob 대신 os.scandir로 직접 순회 (DirEntry의 타입 정보를 재사용해 stat 호출 최소화)
+    # rglob과 마찬가지로 심볼릭 링크 디렉토리 안으로는 들어가지 않음
+    stack = [root]
+    stack_pop = stack.pop
+    stack_append = stack.append
+    while stack:
+        try:
+            it = os.scandir(stack_pop())
+        except OSError:
+            continue
+        
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack_append(entry.path)
+                    continue
+                
+                file_name = entry.name
+                if normcase(file_name).endswith(SAFETENSORS_SUFFIX) and entry.is_file():
+                    entry_path = entry.path
+                    if entry_path.startswith(prefix):
+                        rel = entry_path[prefix_len:]
+                    else:
+                        rel = os.path.relpath(entry_path, base)
+                    name = file_name[:-suffix_len]
+                    names_append(name)
+                    list_append(rel)
+                    dict_set(name, rel)
     
     return paths_dict, paths_list, names
 
 
+def _norm_dir(path) -> str:
+    """비교용 디렉토리 경로 (정규화, 대소문자 통일, 끝에 구분자)를 만듭니다."""
+    return os.path.join(os.path.normcase(os.path.normpath(str(path))), '')
+
+
+def get_file_dict_list_multi(path: Path, roots: Dict[str, Path],
+                             base_dir: Path = None) -> Dict[str, Tuple[Dict[str, str], List[str], List[str]]]:
+    """
+    한 번의 순회로 여러 하위 디렉토리의 파일 목록을 가져옵니다.
+    
+    path 아래를 한 번만 순회하면서 각 파일을 그 파일을 포함하는 모든 roots 디렉토리에 넣습니다.
+    (roots마다 get_file_dict_list를 호출한 것과 같은 결과, 경로 비교는 os.path.normcase 기준)
+    roots에 속하지 않는 디렉토리는 순회하지 않습니다.
+    
+    Args:
+        path: 검색할 상위 경로
+        roots: {키: 하위 디렉토리 경로} 딕셔너리
+        base_dir: 기준 디렉토리 (상대 경로 계산용)
+    
+    Returns:
+        {키: (파일명->경로 딕셔너리, 경로 리스트, 파일명 리스트)} 딕셔너리
+    """
+    if base_dir is None:
+        base_dir = path
+    
+    results = {key: ({}, [], []) for key in roots}
+    
+    base = str(base_dir)
+    prefix = base if base.endswith(os.sep) else base + os.sep
+    prefix_len = len(prefix)
+    suffix_len = len(SAFETENSORS_SUFFIX)
+    normcase = os.path.normcase
+    
+    # 설정 문자열과 디스크의 대소문자/표기가 달라도 같은 경로로 비교
+    root_prefixes = [(_norm_dir(root), key) for key, root in roots.items()]
+    
+    top = _norm_dir(path)
+    stack = [os.path.normpath(str(path))]
+    # path 밖에 있는 root는 따로 순회
+    stack.extend(
+        os.path.normpath(str(roots[key])) for r, key in root_prefixes if not r.startswith(top)
+    )
+    visited = set()
+    
+    while stack:
+        d = stack.pop()
+        nd = _norm_dir(d)
+        # 중첩된 root를 따로 순회할 때 같은 디렉토리를 두 번 읽지 않음
+        if nd in visited:
+            continue
+        visited.add(nd)
+        
+        try:
+            it = os.scandir(d)
+        except OSError:
+            continue
+        
+        with it:
+            for entry in it:
+                if entry.is_dir():
+                    sub = normcase(entry.path) + os.sep
+                    if entry.is_symlink():
+                        # root 자체가 링크인 경우만 따라감 (root 안쪽의 링크는 rglob처럼 제외)
+                        wanted = any(r.startswith(sub) for r, _ in root_prefixes)
+                    else:
+                        # root 안쪽이거나 root로 가는 경로에 있는 디렉토리만 순회
+                        wanted = any(sub.startswith(r) or r.startswith(sub) for r, _ in root_prefixes)
+                    if wanted:
+                        stack.append(entry.path)
+                elif normcase(entry.name).endswith(SAFETENSORS_SUFFIX) and entry.is_file():
+                    file_path = normcase(entry.path)
+                    keys = [key for r, key in root_prefixes if file_path.startswith(r)]
+                    if not keys:
+                        continue
+                    
+                    if entry.path.startswith(prefix):
+                        rel = entry.path[prefix_len:]
+                    else:
+                        rel = os.path.relpath(entry.path, base)
+                    name = entry.name[:-suffix_len]
+                    for key in keys:
+                        paths_dict, paths_list, names = results[key]
+                        names.append(name)
+                        paths_list.append(rel)
+                        paths_dict[name] = rel
+    
+    return results
+
+
 def get_file_list_path(path: Path, base_dir: Path = None) -> List[Path]:
     """
     경로에서 파일 목록을 가져옵니다.
@@ -51,13 +185,22 @@ def get_file_list_path(path: Path, base_dir: Path = None) -> List[Path]:
     return [f.relative_to(base_dir) for f in files]
 
 
-class FileEventHandler(FileSystemEventHandler):
+class FileEventHandler(PatternMatchingEventHandler):
     """파일 시스템 이벤트 핸들러"""
     
-    def __init__(self, callback):
-        super().__init__()
+    def __init__(self, callback, ignore_patterns: Optional[List[str]] = None, debounce: float = 1.0):
+        """
+        Args:
+            callback: 이벤트 콜백
+            ignore_patterns: 콜백을 호출하지 않을 파일 패턴 목록
+            debounce: modified 이벤트를 모으는 시간 (초)
+        """
+        super().__init__(ignore_patterns=ignore_patterns)
         self.callback = callback
-        self.last_event_time = 0.0
+        self.debounce = debounce
+        # {경로: 마지막 modified 이벤트로 콜백을 호출할 타이머}
+        self._timers: Dict[str, threading.Timer] = {}
+        self._timers_lock = threading.Lock()
     
     def on_any_event(self, event: FileSystemEvent):
         """모든 파일 시스템 이벤트를 처리합니다."""
@@ -70,16 +213,43 @@ class FileEventHandler(FileSystemEventHandler):
         self.callback(event)
     
     def _time_check(self, event: FileSystemEvent) -> bool:
-        """중복 이벤트를 제거합니다."""
-        if event.event_type != 'modified':
+        """
+        중복 이벤트를 제거합니다.
+        
+        같은 파일의 modified 이벤트는 마지막 이벤트 후 debounce초 동안 새 이벤트가 없을 때
+        마지막 이벤트로 한 번만 콜백을 호출합니다 (저장 중간 상태를 읽지 않도록).
+        파일이 삭제/이동되면 대기 중인 modified 이벤트는 취소합니다.
+        
+        Returns:
+            지금 콜백을 호출하지 않을 이벤트면 True
+        """
+        event_type = event.event_type
+        if event_type not in ('modified', 'deleted', 'moved'):
             return False
         
-        current_time = time.time()
-        if not hasattr(self, 'last_event_time') or current_time - self.last_event_time > 1:
-            self.last_event_time = current_time
-            return True
+        path = event.src_path
+        with self._timers_lock:
+            timer = self._timers.pop(path, None)
+            if timer is not None:
+                timer.cancel()
+            
+            if event_type != 'modified':
+                return False
+            
+            timer = self._timers[path] = threading.Timer(self.debounce, self._fire, (event,))
+            timer.daemon = True
+            timer.start()
+        return True
+    
+    def _fire(self, event: FileSystemEvent):
+        """대기가 끝난 modified 이벤트로 콜백을 호출합니다."""
+        with self._timers_lock:
+            # 취소되기 직전에 실행된 타이머는 무시
+            if self._timers.get(event.src_path) is not threading.current_thread():
+                return
+            del self._timers[event.src_path]
         
-        return False
+        self.callback(event)
 
 
 class FileObserver:
@@ -102,12 +272,14 @@ class FileObserver:
         self.paths.append(path)
         
         if recursive:
-            path_obj = Path(path)
-            if path_obj.exists():
-                for sub_path in path_obj.rglob("*"):
-                    if sub_path.is_dir() and sub_path.is_symlink():
-                        self.observer.schedule(event_handler, str(sub_path), recursive=recursive)
-                        self.paths.append(str(sub_path))
+            # watchdog은 심볼릭 링크 디렉토리 안을 감시하지 않으므로 따로 등록
+            # 디렉토리만 보면 되므로 rglob 대신 os.walk 사용 (링크 안으로는 들어가지 않음)
+            for dir_path, dir_names, _ in os.walk(path):
+                for dir_name in dir_names:
+                    sub_path = os.path.join(dir_path, dir_name)
+                    if os.path.islink(sub_path):
+                        self.observer.schedule(event_handler, sub_path, recursive=recursive)
+                        self.paths.append(sub_path)
     
     def start(self):
         """감시를 시작합니다."""
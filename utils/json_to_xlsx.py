@@ -1,25 +1,19 @@
 # -*- coding: utf-8 -*-
 """
-JSON to XLSX 변환 유틸리티
+DB to XLSX 변환 유틸리티
 """
+import sqlite3
 import pandas as pd
 from pathlib import Path
-from tinydb import TinyDB
-from tinydb.storages import JSONStorage
+from openpyxl.utils import get_column_letter
 
+from .db_handler import quote_name, decode_loras
 from .print_log import print
 
 
-class UTF8JSONStorage(JSONStorage):
-    """UTF-8 인코딩을 지원하는 JSON 스토리지"""
-    
-    def __init__(self, path, **kwargs):
-        super().__init__(path, encoding='utf-8', **kwargs)
-
-
 def json_to_xlsx(db_path: Path):
     """
-    TinyDB JSON 파일을 XLSX 파일로 변환합니다.
+    SQLite 데이터베이스 파일을 XLSX 파일로 변환합니다.
     
     Args:
         db_path: 데이터베이스 파일 경로
@@ -28,45 +22,47 @@ def json_to_xlsx(db_path: Path):
         print.Warn(f"데이터베이스 파일이 없습니다: {db_path}")
         return
     
-    db = TinyDB(db_path, storage=UTF8JSONStorage)
-    table_names = db.tables()
-    
-    if not table_names:
-        print.Warn("테이블이 없습니다")
-        return
-    
-    new_file = db_path.with_suffix('.xlsx')
-    if new_file.exists():
-        new_file.unlink()
-    
+    # as_uri()는 절대 경로만 받으므로 resolve() 후 변환
+    conn = sqlite3.connect(f'{db_path.resolve().as_uri()}?mode=ro', uri=True)
     try:
+        table_names = [
+            row[0] for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY rowid"
+            )
+        ]
+        
+        if not table_names:
+            print.Warn("테이블이 없습니다")
+            return
+        
+        new_file = db_path.with_suffix('.xlsx')
+        if new_file.exists():
+            new_file.unlink()
+        
         with pd.ExcelWriter(new_file, engine='openpyxl') as writer:
             for table_name in table_names:
-                table = db.table(table_name)
-                data = table.all()
+                df = pd.read_sql_query(f'SELECT * FROM {quote_name(table_name)}', conn)
                 
                 # 리스트를 문자열로 변환
-                for row in data:
-                    for col, value in row.items():
-                        if isinstance(value, list):
-                            row[col] = ', '.join(map(str, value))
+                if 'Loras' in df.columns:
+                    df['Loras'] = df['Loras'].map(lambda v: ', '.join(map(str, decode_loras(v))))
                 
-                df = pd.DataFrame(data)
                 sheet_name = str(table_name)[:31]  # Excel 시트 이름 제한
                 df.to_excel(writer, sheet_name=sheet_name, index=False)
                 
-                # 열 너비 자동 조정
-                for i, col in enumerate(df.columns):
-                    max_len = max(
-                        df[col].astype(str).map(len).max(),
-                        len(str(col))
-                    )
-                    max_len = min(max_len, 200)
-                    writer.sheets[sheet_name].column_dimensions[
-                        chr(65 + i)
-                    ].width = max_len + 2
+                # 열 너비 자동 조정 (모든 열의 최대 글자 수를 한 번에 계산)
+                cell_lens = (
+                    df.astype(str).apply(lambda s: s.str.len().max()).tolist()
+                    if len(df) else [0] * len(df.columns)
+                )
+                column_dimensions = writer.sheets[sheet_name].column_dimensions
+                for i, (col, cell_len) in enumerate(zip(df.columns, cell_lens), 1):
+                    max_len = min(max(int(cell_len), len(str(col))), 200)
+                    # chr(65 + i)는 Z 다음 열(AA...)을 표현하지 못함
+                    column_dimensions[get_column_letter(i)].width = max_len + 2
         
         print.Info("XLSX 파일 생성 완료:", new_file)
     except Exception as e:
         print.exception(show_locals=True)
-
+    finally:
+        conn.close()
@@ -4,7 +4,10 @@
 """
 import os
 import time
+import queue
 import logging
+import threading
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from rich.logging import RichHandler
 from rich.console import Console
@@ -32,7 +35,64 @@ file_handler.setFormatter(logging.Formatter(
     "%(asctime)s %(levelname)-8s %(filename)s:%(funcName)s:%(lineno)4s %(message)s"
 ))
 file_handler.setLevel(logging.DEBUG)
-logger.addHandler(file_handler)
+
+# 파일 쓰기는 QueueListener 스레드에서 처리하고 logger에는 QueueHandler만 붙임
+log_queue = queue.SimpleQueue()
+queue_listener = QueueListener(log_queue, file_handler)
+queue_listener.start()
+atexit.register(queue_listener.stop)
+logger.addHandler(QueueHandler(log_queue))
+
+
+class QueuedFileWriter:
+    """
+    쓰기를 백그라운드 스레드로 넘기는 파일 객체 (rich Console의 file로 사용)
+    
+    렌더링은 호출한 스레드에서 끝나고, 완성된 문자열만 큐를 통해 파일에 씁니다.
+    """
+    
+    encoding = 'utf-8'
+    
+    def __init__(self, file):
+        """
+        Args:
+            file: 실제로 쓸 텍스트 파일 객체
+        """
+        self._file = file
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name='console-log-writer', daemon=True)
+        self._thread.start()
+    
+    def write(self, text: str) -> int:
+        """문자열을 쓰기 큐에 넣습니다."""
+        self._queue.put(text)
+        return len(text)
+    
+    def flush(self):
+        """쓰기 스레드가 처리하므로 아무것도 하지 않습니다."""
+    
+    def isatty(self) -> bool:
+        """터미널이 아님을 알립니다."""
+        return False
+    
+    def close(self):
+        """남은 내용을 모두 쓰고 파일을 닫습니다."""
+        self._queue.put(None)
+        self._thread.join()
+        self._file.close()
+    
+    def _run(self):
+        """큐의 문자열을 파일에 씁니다. None을 받으면 종료합니다."""
+        get = self._queue.get
+        write = self._file.write
+        while True:
+            text = get()
+            if text is None:
+                break
+            write(text)
+            if self._queue.empty():
+                self._file.flush()
+
 
 # 터미널 테마
 cmd_theme = TerminalTheme(
@@ -64,13 +124,23 @@ cmd_theme = TerminalTheme(
 console_screen = Console(record=True)
 console_screen.print("\033[0m")
 
-console_log_file = open(log_dir / f"{timestamp}.console.log", "a", encoding="utf-8")
-console_log = Console(record=True, file=console_log_file)
+console_log_file = QueuedFileWriter(
+    open(log_dir / f"{timestamp}.console.log", "a", encoding="utf-8")
+)
+# 로그 파일용 콘솔은 save_html에 쓰지 않으므로 기록(record)하지 않음
+console_log = Console(file=console_log_file)
 console_log.print("\033[0m")
 
 atexit.register(console_log_file.close)
 
 
+# 색상별 rich 마크업 태그 (호출마다 만들지 않도록 미리 생성)
+_COLOR_TAGS = {
+    color: (f'[{color}]', f'[/{color}]')
+    for color in ('blue', 'yellow', 'red', 'green', 'cyan', 'magenta', 'white')
+}
+
+
 class PrintHelper:
     """출력 및 로깅 헬퍼 클래스"""
     
@@ -108,7 +178,8 @@ class PrintHelper:
     
     def _color(self, color: str, msg: str, *args, _stack_offset: int = 3):
         """색상이 있는 메시지를 출력합니다."""
-        self(f'[{color}]{msg}[/{color}]', *args, _stack_offset=_stack_offset)
+        open_tag, close_tag = _COLOR_TAGS[color]
+        self(f'{open_tag}{msg}{close_tag}', *args, _stack_offset=_stack_offset)
     
     def Blue(self, msg: str, *args):
         """파란색 메시지를 출력합니다."""
@@ -21,11 +21,14 @@ def random_weight_count(d: Dict[str, Union[int, float]], count: int = 1, default
     if not isinstance(d, dict):
         return default or []
     
-    for k, v in d.items():
-        if not isinstance(v, (int, float)):
-            raise TypeError(f'{k}: {v}는 숫자가 아닙니다')
-    
-    return random.choices(list(d.keys()), weights=list(d.values()), k=count)
+    try:
+        return random.choices(list(d), weights=list(d.values()), k=count)
+    except TypeError:
+        # 숫자가 아닌 가중치는 실패했을 때만 찾아서 알려줌
+        for k, v in d.items():
+            if not isinstance(v, (int, float)):
+                raise TypeError(f'{k}: {v}는 숫자가 아닙니다') from None
+        raise
 
 
 def random_min_max(v: Union[Tuple, List, set, int, float]) -> Union[int, float]:
@@ -85,12 +88,20 @@ def random_dict_weight(d: Dict, weight_key: str, count: int = 1, default: List[s
     Returns:
         선택된 키 리스트
     """
-    weight_dict = {k: v[weight_key] for k, v in d.items() if weight_key in v}
+    # 중간 딕셔너리 없이 키와 가중치 리스트를 한 번에 만듦
+    keys = []
+    weights = []
+    keys_append = keys.append
+    weights_append = weights.append
+    for k, v in d.items():
+        if weight_key in v:
+            keys_append(k)
+            weights_append(v[weight_key])
     
-    if not weight_dict:
+    if not keys:
         return default or []
     
-    return random.choices(list(weight_dict.keys()), weights=list(weight_dict.values()), k=count)
+    return random.choices(keys, weights=weights, k=count)
 
 
 def seed_int() -> int:
@@ -100,7 +111,7 @@ def seed_int() -> int:
     Returns:
         64비트 정수 시드
     """
-    return random.randint(0, 0xffffffffffffffff)
+    return random.getrandbits(64)
 
 
 def random_items_count(items: Union[Dict, List, Tuple], count: int = 1) -> List:
@@ -114,14 +125,15 @@ def random_items_count(items: Union[Dict, List, Tuple], count: int = 1) -> List:
     Returns:
         선택된 항목 리스트
     """
-    if isinstance(items, dict):
-        items = list(items.keys())
-    
-    if not isinstance(items, (list, tuple)):
+    if not isinstance(items, (dict, list, tuple)):
         raise ValueError(f"항목이 리스트나 튜플이 아닙니다: {items}")
     
-    if len(items) > count:
-        return random.sample(items, count)
+    # 전부 선택하는 경우 키 리스트를 한 번만 만듦
+    if len(items) <= count:
+        return list(items)
+    
+    if isinstance(items, dict):
+        items = list(items)
     
-    return list(items)
+    return random.sample(items, count)
 
@@ -5,6 +5,10 @@
 from typing import Dict, Tuple, List, Any
 
 
+# {(포함 타입 튜플, 제외 타입 튜플): {값의 타입: 포함 여부}}
+_type_match_cache: Dict[Tuple[Tuple, Tuple], Dict[type, bool]] = {}
+
+
 def get_type_list(dic: Dict, type_tuple: Tuple, exclude_tuple: Tuple = ()) -> List[str]:
     """
     딕셔너리에서 특정 타입의 값의 키를 리스트로 반환합니다.
@@ -20,10 +24,19 @@ def get_type_list(dic: Dict, type_tuple: Tuple, exclude_tuple: Tuple = ()) -> Li
     if not isinstance(dic, dict):
         return []
     
-    result = [
-        k for k, v in dic.items()
-        if isinstance(v, type_tuple) and not isinstance(v, exclude_tuple)
-    ]
+    # 값마다 isinstance를 두 번 부르지 않도록 타입별 판정 결과를 재사용
+    matches = _type_match_cache.get((type_tuple, exclude_tuple))
+    if matches is None:
+        matches = _type_match_cache[(type_tuple, exclude_tuple)] = {}
+    
+    result = []
+    for k, v in dic.items():
+        t = type(v)
+        match = matches.get(t)
+        if match is None:
+            match = matches[t] = isinstance(v, type_tuple) and not isinstance(v, exclude_tuple)
+        if match:
+            result.append(k)
     
     return result
 
@@ -3,20 +3,74 @@
 YAML 파일 처리 유틸리티
 """
 import os
-from typing import Dict, Any, Optional, List
+import copy
+import fnmatch
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Tuple
 from pathlib import Path
 import yaml
-from ruamel.yaml import YAML
+import orjson
+
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
+
+@functools.lru_cache(maxsize=512)
+def _load_cached(yml_path: str, mtime_ns: int, size: int) -> Any:
+    """
+    YAML 파일을 파싱합니다. (경로, 수정 시각, 크기)가 같으면 캐시된 결과를 반환합니다.
+    
+    .json 파일은 YAML 파서 대신 orjson으로 파싱합니다.
+    반환값은 캐시와 공유되므로 직접 수정하면 안 됩니다.
+    """
+    with open(yml_path, 'rb') as f:
+        if yml_path.lower().endswith('.json'):
+            return orjson.loads(f.read())
+        return yaml.load(f, Loader=SafeLoader)
+
+
+def _load_file(file_info: Tuple[str, int, int]) -> Tuple[Any, Optional[Exception]]:
+    """
+    merge_yml_files의 작업 스레드에서 파일 하나를 파싱합니다.
+    
+    Args:
+        file_info: (경로, 수정 시각, 크기) 튜플
+    
+    Returns:
+        (데이터, 예외) 튜플 - 실패하면 데이터는 None
+    """
+    try:
+        return _load_cached(*file_info), None
+    except Exception as e:
+        return None, e
+
+
+# merge_yml_files 동시 파싱 스레드 수
+MERGE_MAX_WORKERS = 8
+
+# merge_yml_files 결과 캐시: {(디렉토리, 패턴): (파일 서명, 병합 결과)}
+_merge_cache: Dict[Tuple[str, str], Tuple[tuple, Dict[str, Any]]] = {}
 
 
 class YAMLHandler:
     """YAML 파일을 읽고 쓰는 클래스 (주석 보존)"""
     
-    def __init__(self, allow_duplicate_keys: bool = True):
+    def __init__(self, allow_duplicate_keys: bool = True, preserve_comments: bool = True):
         """
         Args:
             allow_duplicate_keys: 중복 키 허용 여부
+            preserve_comments: 주석 보존 여부 (False면 ruamel.yaml 대신 PyYAML C 로더 사용)
         """
+        self.preserve_comments = preserve_comments
+        if not preserve_comments:
+            # PyYAML은 중복 키를 항상 허용 (나중 값 사용)
+            self.yaml = None
+            return
+        
+        from ruamel.yaml import YAML
         self.yaml = YAML()
         self.yaml.preserve_quotes = True
         self.yaml.width = 1000000  # 줄바꿈 방지
@@ -25,7 +79,7 @@ class YAMLHandler:
     
     def load(self, yml_path: str) -> Optional[Dict[str, Any]]:
         """
-        YAML 파일을 로드합니다 (주석 보존).
+        YAML 파일을 로드합니다 (preserve_comments가 True면 주석 보존).
         
         Args:
             yml_path: YAML 파일 경로
@@ -37,6 +91,9 @@ class YAMLHandler:
             return None
         
         try:
+            if self.yaml is None:
+                with open(yml_path, 'rb') as f:
+                    return yaml.load(f, Loader=SafeLoader)
             with open(yml_path, 'r', encoding='utf-8') as f:
                 return self.yaml.load(f)
         except Exception as e:
@@ -45,7 +102,7 @@ class YAMLHandler:
     
     def save(self, yml_path: str, yml_data: Dict[str, Any]) -> bool:
         """
-        YAML 파일을 저장합니다 (주석 보존).
+        YAML 파일을 저장합니다 (preserve_comments가 True면 주석 보존).
         
         Args:
             yml_path: YAML 파일 경로
@@ -57,7 +114,11 @@ class YAMLHandler:
         try:
             os.makedirs(os.path.dirname(yml_path), exist_ok=True)
             with open(yml_path, 'w', encoding='utf-8') as f:
-                self.yaml.dump(yml_data, f)
+                if self.yaml is None:
+                    yaml.dump(yml_data, f, Dumper=SafeDumper, allow_unicode=True,
+                              sort_keys=False, width=1000000)
+                else:
+                    self.yaml.dump(yml_data, f)
             return True
         except Exception as e:
             print(f"  오류: YML 파일 저장 실패: {e}")
@@ -66,7 +127,9 @@ class YAMLHandler:
     @staticmethod
     def load_simple(yml_path: str) -> Optional[Dict[str, Any]]:
         """
-        간단한 YAML 파일 로드 (PyYAML 사용, 주석 보존 안함).
+        간단한 YAML 파일 로드 (PyYAML C 로더 사용, 주석 보존 안함).
+        
+        파일이 바뀌지 않았으면 (수정 시각, 크기 기준) 다시 파싱하지 않습니다.
         
         Args:
             yml_path: YAML 파일 경로
@@ -74,12 +137,14 @@ class YAMLHandler:
         Returns:
             YAML 데이터 또는 None
         """
-        if not os.path.exists(yml_path):
+        try:
+            st = os.stat(yml_path)
+        except OSError:
             return None
         
         try:
-            with open(yml_path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
+            # 호출자가 결과를 수정하므로 캐시 원본이 아닌 복사본을 반환
+            return copy.deepcopy(_load_cached(str(yml_path), st.st_mtime_ns, st.st_size))
         except Exception as e:
             print(f"  오류: YML 파일 읽기 실패: {e}")
             return None
@@ -89,6 +154,10 @@ class YAMLHandler:
         """
         디렉토리의 여러 YAML 파일을 병합합니다.
         
+        디렉토리의 파일 목록과 각 파일의 (수정 시각, 크기)가 이전 호출과 같으면
+        파일을 다시 읽지 않고 이전 병합 결과를 반환합니다.
+        파일은 스레드 풀에서 함께 읽고, 병합은 파일 이름 순서대로 합니다.
+        
         Args:
             path: 디렉토리 경로
             pattern: 파일 패턴
@@ -97,13 +166,40 @@ class YAMLHandler:
             병합된 딕셔너리
         """
         result = {}
-        if not path.exists():
+        try:
+            it = os.scandir(path)
+        except OSError:
             return result
         
-        for yml_file in path.glob(pattern):
-            data = YAMLHandler.load_simple(str(yml_file))
+        files = []
+        with it:
+            for entry in it:
+                if fnmatch.fnmatch(entry.name, pattern) and entry.is_file():
+                    st = entry.stat()
+                    files.append((entry.path, st.st_mtime_ns, st.st_size))
+        # 같은 키가 여러 파일에 있을 때 결과가 디렉토리 순서에 따라 달라지지 않도록 정렬
+        files.sort()
+        
+        signature = tuple(files)
+        cache_key = (str(path), pattern)
+        cached = _merge_cache.get(cache_key)
+        if cached is not None and cached[0] == signature:
+            return copy.deepcopy(cached[1])
+        
+        if len(files) > 1:
+            with ThreadPoolExecutor(max_workers=min(MERGE_MAX_WORKERS, len(files))) as ex:
+                loaded = list(ex.map(_load_file, files))
+        else:
+            loaded = [_load_file(f) for f in files]
+        
+        for data, e in loaded:
+            if e is not None:
+                print(f"  오류: YML 파일 읽기 실패: {e}")
+                continue
             if data:
                 result.update(data)
         
-        return result
+        # 캐시에는 파일 캐시와 값을 공유하는 원본을 두고 호출자에게는 복사본을 반환
+        _merge_cache[cache_key] = (signature, result)
+        return copy.deepcopy(result)
 